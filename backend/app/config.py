@@ -1,26 +1,40 @@
 """Application configuration."""
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
 
 class Settings(BaseSettings):
     """Application settings."""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True
+    )
+    
     database_url: str = "sqlite:///./instagram_tool.db"
     secret_key: str = "change-this-to-a-secure-random-string"
     cors_origins: str = "http://localhost:5173"
     max_daily_unfollows: int = 50
     min_action_delay: int = 30
     max_action_delay: int = 60
+    unfollow_concurrency: int = 1  # Browser pages unfollowing in parallel, each paced by the action delay
+    scrape_block_assets: bool = True  # Abort image/media/font/CSS requests while scraping
+    debug_screenshots: bool = False  # Save Playwright debug screenshots under logs/debug
+    log_api_responses: bool = False  # Append captured Instagram API responses to logs/api_logs
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-    
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string."""
+        """Parse CORS origins from comma-separated string (computed once)."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment only once."""
+    return Settings()
+
+
+settings = get_settings()
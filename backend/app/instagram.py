@@ -2,15 +2,117 @@
 import asyncio
 import random
 import sys
+import time
 from typing import List, Dict, Optional
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-from datetime import datetime
+from datetime import datetime, timezone
 import json
+import os
+from .config import settings
+from .instagram_common import BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PARTS, CONTEXT_OPTIONS, DISMISS_POPUPS_SCRIPT, LAUNCH_ARGS
+from .instagram_http import check_session, fetch_profile_info
 
 # Fix for Windows asyncio subprocess issues
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+# Where logged-in storage state (cookies + localStorage) is kept between runs
+_STATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sessions')
+
+# How long a profile page that was just loaded can be reused without navigating again
+_PROFILE_REUSE_SECONDS = 30
+
+# Suffixes Instagram uses for abbreviated counts ("12.3K", "4.5M")
+_COUNT_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# Scrolls a followers/following dialog and harvests its rows in one in-page call,
+# so collecting a list costs a single round-trip instead of several per user.
+_HARVEST_DIALOG_JS = """async (dialog, limit) => {
+    const seen = new Set();
+    const out = [];
+    const scroller = dialog.querySelector('div[style*="overflow"]') || dialog;
+    let stalls = 0;
+    for (let i = 0; i < 50 && out.length < limit; i++) {
+        const lastLen = out.length;
+        for (const a of scroller.querySelectorAll('a[href^="/"][role="link"]')) {
+            const u = a.getAttribute('href').split('/')[1];
+            if (u && !seen.has(u)) {
+                seen.add(u);
+                const p = a.closest('div.x1dm5mii');
+                out.push({
+                    username: u,
+                    full_name: p?.querySelector('span')?.innerText || '',
+                    is_verified: !!p?.querySelector('svg[aria-label="Verified"]')
+                });
+            }
+        }
+        const before = scroller.scrollTop;
+        scroller.scrollTop = scroller.scrollHeight;
+        // Stop once neither the scroll position nor the list has grown twice in a row
+        stalls = scroller.scrollTop === before && out.length === lastLen ? stalls + 1 : 0;
+        if (stalls >= 2) break;
+        await new Promise(r => setTimeout(r, 1500 + Math.random() * 1000));
+    }
+    return out.slice(0, limit);
+}"""
+
+
+async def _abort_heavy_assets(route):
+    """Route handler that aborts requests for assets and trackers scraping doesn't need."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _new_context(browser: Browser, storage_state: Optional[str] = None,
+                       block_assets: bool = False) -> BrowserContext:
+    """Create a context with the shared options and the popup-dismissing script."""
+    context = await browser.new_context(storage_state=storage_state, **CONTEXT_OPTIONS)
+    await context.add_init_script(DISMISS_POPUPS_SCRIPT)
+    if block_assets:
+        await context.route('**/*', _abort_heavy_assets)
+    return context
+
+
+class BrowserPool:
+    """Playwright browsers shared by every InstagramBot in the process, one per headless mode."""
+    
+    _playwright = None
+    _browsers: Dict[bool, Browser] = {}
+    _lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    async def get_browser(cls, headless: bool = True) -> Browser:
+        """Return the shared browser for the given mode, starting Playwright on first use."""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            browser = cls._browsers.get(headless)
+            if browser is None or not browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                browser = await cls._playwright.chromium.launch(
+                    headless=headless,
+                    args=LAUNCH_ARGS
+                )
+                cls._browsers[headless] = browser
+            return browser
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close the shared browsers and stop Playwright."""
+        for browser in cls._browsers.values():
+            try:
+                await browser.close()
+            except:
+                pass
+        cls._browsers = {}
+        if cls._playwright:
+            await cls._playwright.stop()
+            cls._playwright = None
+
 
 class InstagramBot:
     """Instagram bot for follower management."""
@@ -21,6 +123,8 @@ class InstagramBot:
         self.page: Optional[Page] = None
         self.is_logged_in = False
         self.username: Optional[str] = None
+        self._blocking_assets = False
+        self._last_visit: Optional[tuple] = None  # (page, url, monotonic timestamp)
         
     async def start(self, headless: bool = True):
         """Start the browser."""
@@ -29,40 +133,45 @@ class InstagramBot:
             import nest_asyncio
             nest_asyncio.apply()
         
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        self.context = await self.browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        self.browser = await BrowserPool.get_browser(headless)
+        await self._open_context()
+    
+    async def _open_context(self, storage_state: Optional[str] = None):
+        """Create this bot's context and page, optionally restoring saved storage state."""
+        self.context = await _new_context(self.browser, storage_state)
+        self._blocking_assets = False
+        await self._block_assets(settings.scrape_block_assets)
         self.page = await self.context.new_page()
+        self._last_visit = None
+    
+    @staticmethod
+    def state_path(username: str) -> str:
+        """Path of the saved storage state for an account."""
+        return os.path.join(_STATE_DIR, f'{username}.json')
         
     async def close(self):
-        """Close the browser."""
+        """Close this bot's page and context; the shared browser stays up."""
         if self.page:
             await self.page.close()
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
             
+    async def _block_assets(self, enabled: bool):
+        """Turn aborting of images/media/fonts/stylesheets on or off for this bot."""
+        if enabled and not self._blocking_assets:
+            await self.context.route('**/*', _abort_heavy_assets)
+        elif not enabled and self._blocking_assets:
+            await self.context.unroute('**/*', _abort_heavy_assets)
+        self._blocking_assets = enabled
+    
     async def login(self, username: str, password: str) -> Dict:
         """Login to Instagram."""
+        # The login form relies on its stylesheet for layout, so load everything here
+        await self._block_assets(False)
         try:
-            await self.page.goto('https://www.instagram.com/accounts/login/', wait_until='networkidle')
-            await asyncio.sleep(random.uniform(2, 4))
-            
-            # Handle cookie consent if present
-            try:
-                cookie_button = self.page.locator('button:has-text("Allow all cookies")')
-                if await cookie_button.is_visible(timeout=3000):
-                    await cookie_button.click()
-                    await asyncio.sleep(1)
-            except:
-                pass
+            await self.page.goto('https://www.instagram.com/accounts/login/', wait_until='domcontentloaded')
+            await self.page.wait_for_selector('input[name="username"]', timeout=10000)
+            await asyncio.sleep(random.uniform(0.3, 0.8))
             
             # Fill login form
             await self.page.fill('input[name="username"]', username)
@@ -72,42 +181,39 @@ class InstagramBot:
             
             # Click login button
             await self.page.click('button[type="submit"]')
-            await asyncio.sleep(5)
+            
+            # Wait until we either leave the login page or an error is shown
+            left_login = asyncio.create_task(
+                self.page.wait_for_url(lambda url: '/accounts/login' not in url, timeout=15000)
+            )
+            login_error = asyncio.create_task(
+                self.page.wait_for_selector('p[data-testid="login-error-message"]', timeout=15000)
+            )
+            done, pending = await asyncio.wait({left_login, login_error}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
             
             # Check for errors
-            error_element = await self.page.query_selector('p[data-testid="login-error-message"]')
+            error_element = None
+            for task in done:
+                if task.exception() is None and task is login_error:
+                    error_element = task.result()
             if error_element:
                 error_text = await error_element.inner_text()
                 return {'success': False, 'error': error_text}
             
-            # Check if we're on the home page or if there's a "Save Info" prompt
+            # Popups such as "Save Info" are dismissed by the init script
             current_url = self.page.url
             
-            # Handle "Save Your Login Info" prompt
-            try:
-                not_now_button = self.page.locator('button:has-text("Not now")')
-                if await not_now_button.is_visible(timeout=3000):
-                    await not_now_button.click()
-                    await asyncio.sleep(2)
-            except:
-                pass
-            
-            # Handle notifications prompt
-            try:
-                not_now_button = self.page.locator('button:has-text("Not Now")')
-                if await not_now_button.is_visible(timeout=3000):
-                    await not_now_button.click()
-                    await asyncio.sleep(2)
-            except:
-                pass
-            
             # Check if login was successful
             if 'instagram.com' in current_url and '/accounts/login' not in current_url:
                 self.is_logged_in = True
                 self.username = username
                 
-                # Save cookies
+                # Save cookies, plus full storage state so the next run can restore it in one step
                 cookies = await self.context.cookies()
+                os.makedirs(_STATE_DIR, exist_ok=True)
+                await self.context.storage_state(path=self.state_path(username))
                 
                 return {
                     'success': True,
@@ -119,13 +225,43 @@ class InstagramBot:
                 
         except Exception as e:
             return {'success': False, 'error': str(e)}
+        finally:
+            await self._block_assets(settings.scrape_block_assets)
     
-    async def load_session(self, cookies: List[Dict]):
-        """Load session from saved cookies."""
+    async def load_session(self, cookies: Optional[List[Dict]] = None, path: Optional[str] = None):
+        """Load session from a saved storage state file or from saved cookies."""
         try:
-            await self.context.add_cookies(cookies)
-            await self.page.goto('https://www.instagram.com/', wait_until='networkidle')
-            await asyncio.sleep(3)
+            if path:
+                # Check the state file before tearing down the current context for it
+                if not os.path.exists(path):
+                    return {'success': False, 'error': f'No saved session at {path}'}
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        json.load(f)
+                except (OSError, ValueError) as e:
+                    return {'success': False, 'error': f'Unreadable saved session: {e}'}
+                
+                # Restores cookies and localStorage together when the context is created
+                await self.page.close()
+                await self.context.close()
+                try:
+                    await self._open_context(storage_state=path)
+                except Exception:
+                    # Never leave the bot holding the closed context
+                    await self._open_context()
+                    raise
+                cookies = await self.context.cookies()
+            else:
+                await self.context.add_cookies(cookies)
+            
+            # Validate over plain HTTP first; only load the page if that fails
+            if await check_session(cookies):
+                self.is_logged_in = True
+                return {'success': True}
+            
+            await self.page.goto('https://www.instagram.com/', wait_until='domcontentloaded')
+            # Either the feed (logged in) or the login form renders
+            await self.page.wait_for_selector('svg[aria-label="Home"], input[name="username"]', timeout=10000)
             
             # Check if we're logged in
             if '/accounts/login' not in self.page.url:
@@ -136,80 +272,45 @@ class InstagramBot:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    async def _goto_profile(self, page: Page, username: str) -> bool:
+        """Open a profile unless this page loaded it moments ago. Returns True if it navigated."""
+        target = f'https://www.instagram.com/{username}/'
+        if self._last_visit:
+            last_page, last_url, visited_at = self._last_visit
+            if (page is last_page and last_url == target and page.url == target
+                    and time.monotonic() - visited_at < _PROFILE_REUSE_SECONDS):
+                return False
+        
+        await page.goto(target, wait_until='domcontentloaded')
+        self._last_visit = (page, target, time.monotonic())
+        return True
+    
+    async def _harvest_dialog(self, username: str, kind: str, limit: int) -> List[Dict]:
+        """Open the followers/following dialog, collect its rows and close it."""
+        link = self.page.locator(f'a[href="/{username}/{kind}/"]')
+        await link.click()
+        await asyncio.sleep(3)
+        
+        dialog = self.page.locator('div[role="dialog"]')
+        users = await dialog.evaluate(_HARVEST_DIALOG_JS, limit)
+        
+        await self.page.keyboard.press('Escape')
+        await asyncio.sleep(1)
+        
+        return users
+    
     async def get_followers(self, username: str, limit: int = 500) -> List[Dict]:
         """Get followers list."""
         if not self.is_logged_in:
             raise Exception("Not logged in")
         
         try:
-            # Go to profile
-            await self.page.goto(f'https://www.instagram.com/{username}/', wait_until='networkidle')
-            await asyncio.sleep(random.uniform(2, 4))
-            
-            # Click followers link
-            followers_link = self.page.locator(f'a[href="/{username}/followers/"]')
-            await followers_link.click()
-            await asyncio.sleep(3)
-            
-            # Get the dialog
-            dialog = self.page.locator('div[role="dialog"]')
-            
-            followers = []
-            seen_usernames = set()
-            
-            # Scroll and collect followers
-            for _ in range(min(limit // 12, 50)):  # Instagram shows ~12 per scroll
-                # Get current users in the dialog
-                user_elements = await dialog.locator('a[href^="/"][role="link"]').all()
-                
-                for element in user_elements:
-                    try:
-                        href = await element.get_attribute('href')
-                        username_from_href = href.strip('/').split('/')[0]
-                        
-                        if username_from_href and username_from_href not in seen_usernames:
-                            seen_usernames.add(username_from_href)
-                            
-                            # Get user details from the parent container
-                            parent = element.locator('xpath=ancestor::div[contains(@class, "x1dm5mii")]').first
-                            
-                            # Try to get full name and verified status
-                            full_name = ""
-                            is_verified = False
-                            
-                            try:
-                                name_element = await parent.locator('span').first.inner_text()
-                                full_name = name_element
-                            except:
-                                pass
-                            
-                            try:
-                                verified = await parent.locator('svg[aria-label="Verified"]').count()
-                                is_verified = verified > 0
-                            except:
-                                pass
-                            
-                            followers.append({
-                                'username': username_from_href,
-                                'full_name': full_name,
-                                'is_verified': is_verified
-                            })
-                            
-                            if len(followers) >= limit:
-                                break
-                    except:
-                        continue
-                
-                if len(followers) >= limit:
-                    break
-                
-                # Scroll down in the dialog
-                await dialog.evaluate('(element) => element.scrollTop = element.scrollHeight')
-                await asyncio.sleep(random.uniform(1.5, 2.5))
+            # Go to profile if not already there
+            if await self._goto_profile(self.page, username):
+                await self.page.wait_for_selector(f'a[href="/{username}/followers/"]', timeout=10000)
+                await asyncio.sleep(random.uniform(0.3, 0.8))
             
-            # Close dialog
-            await self.page.keyboard.press('Escape')
-            await asyncio.sleep(1)
+            followers = await self._harvest_dialog(username, 'followers', limit)
             
             return followers[:limit]
             
@@ -223,70 +324,11 @@ class InstagramBot:
         
         try:
             # Go to profile if not already there
-            if f'instagram.com/{username}' not in self.page.url:
-                await self.page.goto(f'https://www.instagram.com/{username}/', wait_until='networkidle')
-                await asyncio.sleep(random.uniform(2, 4))
-            
-            # Click following link
-            following_link = self.page.locator(f'a[href="/{username}/following/"]')
-            await following_link.click()
-            await asyncio.sleep(3)
-            
-            # Get the dialog
-            dialog = self.page.locator('div[role="dialog"]')
-            
-            following = []
-            seen_usernames = set()
+            if await self._goto_profile(self.page, username):
+                await self.page.wait_for_selector(f'a[href="/{username}/following/"]', timeout=10000)
+                await asyncio.sleep(random.uniform(0.3, 0.8))
             
-            # Scroll and collect following
-            for _ in range(min(limit // 12, 50)):
-                user_elements = await dialog.locator('a[href^="/"][role="link"]').all()
-                
-                for element in user_elements:
-                    try:
-                        href = await element.get_attribute('href')
-                        username_from_href = href.strip('/').split('/')[0]
-                        
-                        if username_from_href and username_from_href not in seen_usernames:
-                            seen_usernames.add(username_from_href)
-                            
-                            parent = element.locator('xpath=ancestor::div[contains(@class, "x1dm5mii")]').first
-                            
-                            full_name = ""
-                            is_verified = False
-                            
-                            try:
-                                name_element = await parent.locator('span').first.inner_text()
-                                full_name = name_element
-                            except:
-                                pass
-                            
-                            try:
-                                verified = await parent.locator('svg[aria-label="Verified"]').count()
-                                is_verified = verified > 0
-                            except:
-                                pass
-                            
-                            following.append({
-                                'username': username_from_href,
-                                'full_name': full_name,
-                                'is_verified': is_verified
-                            })
-                            
-                            if len(following) >= limit:
-                                break
-                    except:
-                        continue
-                
-                if len(following) >= limit:
-                    break
-                
-                await dialog.evaluate('(element) => element.scrollTop = element.scrollHeight')
-                await asyncio.sleep(random.uniform(1.5, 2.5))
-            
-            # Close dialog
-            await self.page.keyboard.press('Escape')
-            await asyncio.sleep(1)
+            following = await self._harvest_dialog(username, 'following', limit)
             
             return following[:limit]
             
@@ -295,23 +337,30 @@ class InstagramBot:
     
     async def get_user_info(self, username: str) -> Optional[Dict]:
         """Get detailed user information."""
+        # Fast path: read the profile JSON instead of rendering the page
+        user = await fetch_profile_info(username, await self.context.cookies())
+        if user:
+            return {
+                'username': username,
+                'full_name': user.get('full_name') or "",
+                'follower_count': user.get('edge_followed_by', {}).get('count', 0),
+                'is_verified': user.get('is_verified', False)
+            }
+        
         try:
-            await self.page.goto(f'https://www.instagram.com/{username}/', wait_until='networkidle')
-            await asyncio.sleep(random.uniform(2, 3))
+            await self._goto_profile(self.page, username)
+            await self.page.wait_for_selector('section header', timeout=10000)
             
             # Get follower count
             follower_count = 0
             try:
                 # Look for followers link
                 followers_link = await self.page.locator(f'a[href="/{username}/followers/"]').first.inner_text()
-                # Extract number from text like "1,234 followers"
-                follower_text = followers_link.split()[0].replace(',', '')
-                if 'K' in follower_text:
-                    follower_count = int(float(follower_text.replace('K', '')) * 1000)
-                elif 'M' in follower_text:
-                    follower_count = int(float(follower_text.replace('M', '')) * 1000000)
-                else:
-                    follower_count = int(follower_text)
+                # Extract number from text like "1,234 followers" or "12.3K followers"
+                follower_text = followers_link.split(None, 1)[0]
+                multiplier = _COUNT_MULTIPLIERS.get(follower_text[-1], 1)
+                number = float(follower_text.rstrip('KMB').replace(',', ''))
+                follower_count = int(number * multiplier)
             except:
                 pass
             
@@ -339,13 +388,18 @@ class InstagramBot:
         if not self.is_logged_in:
             raise Exception("Not logged in")
         
+        return await self._unfollow_on_page(self.page, username)
+    
+    async def _unfollow_on_page(self, page: Page, username: str) -> Dict:
+        """Unfollow a user using the given page."""
         try:
-            # Go to user's profile
-            await self.page.goto(f'https://www.instagram.com/{username}/', wait_until='networkidle')
-            await asyncio.sleep(random.uniform(2, 3))
+            # Go to user's profile unless it was just loaded
+            if await self._goto_profile(page, username):
+                await page.wait_for_selector('button:has-text("Following"), button:has-text("Follow")', timeout=10000)
+                await asyncio.sleep(random.uniform(0.3, 0.8))
             
             # Find and click the "Following" button
-            following_button = self.page.locator('button:has-text("Following")')
+            following_button = page.locator('button:has-text("Following")')
             
             if not await following_button.is_visible():
                 return {'success': False, 'error': 'User not followed or button not found'}
@@ -354,7 +408,7 @@ class InstagramBot:
             await asyncio.sleep(random.uniform(1, 2))
             
             # Confirm unfollow in the dialog
-            unfollow_button = self.page.locator('button:has-text("Unfollow")')
+            unfollow_button = page.locator('button:has-text("Unfollow")')
             
             if await unfollow_button.is_visible(timeout=3000):
                 await unfollow_button.click()
@@ -367,21 +421,58 @@ class InstagramBot:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    async def unfollow_batch(self, usernames: List[str], min_delay: int = 30, max_delay: int = 60) -> List[Dict]:
-        """Unfollow multiple users with delays."""
-        results = []
+    async def unfollow_batch(self, usernames: List[str], min_delay: int = 30, max_delay: int = 60,
+                             concurrency: Optional[int] = None) -> List[Dict]:
+        """Unfollow multiple users, spreading them over parallel browser contexts.
         
-        for i, username in enumerate(usernames):
-            result = await self.unfollow_user(username)
-            results.append({
-                **result,
-                'username': username,
-                'timestamp': datetime.utcnow().isoformat()
-            })
-            
-            # Add delay between unfollows (except for the last one)
-            if i < len(usernames) - 1:
-                delay = random.uniform(min_delay, max_delay)
-                await asyncio.sleep(delay)
+        Each context paces itself with the usual random delay, so at most
+        ``concurrency`` unfollows are in flight at any time (UNFOLLOW_CONCURRENCY
+        by default; more contexts multiply the overall unfollow rate).
+        """
+        if not self.is_logged_in:
+            raise Exception("Not logged in")
+        if not usernames:
+            return []
+        
+        if concurrency is None:
+            concurrency = settings.unfollow_concurrency
+        cookies = await self.context.cookies()
+        contexts: List[BrowserContext] = []
+        pages: asyncio.Queue = asyncio.Queue()
+        
+        waiting = len(usernames)
+        _uniform = random.uniform
+        _sleep = asyncio.sleep
+        _iso = lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
         
-        return results
+        async def unfollow(username: str) -> Dict:
+            nonlocal waiting
+            page = await pages.get()
+            waiting -= 1
+            try:
+                result = await self._unfollow_on_page(page, username)
+                timestamp = _iso()
+                
+                # Pace this context before it picks up the next user
+                if waiting > 0:
+                    await _sleep(_uniform(min_delay, max_delay))
+                return {**result, 'username': username, 'timestamp': timestamp}
+            finally:
+                pages.put_nowait(page)
+        
+        try:
+            # Opened inside the try so contexts created before a failure are still closed
+            for _ in range(max(1, min(concurrency, len(usernames)))):
+                # Same setup as the bot's own context: popup dismissal and asset blocking
+                context = await _new_context(self.browser, block_assets=settings.scrape_block_assets)
+                contexts.append(context)
+                await context.add_cookies(cookies)
+                pages.put_nowait(await context.new_page())
+            
+            return list(await asyncio.gather(*(unfollow(username) for username in usernames)))
+        finally:
+            for context in contexts:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
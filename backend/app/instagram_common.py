@@ -0,0 +1,42 @@
+"""Helpers shared by the async (instagram.py) and sync (instagram_sync.py) Playwright flows."""
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+IG_APP_ID = '936619743392459'  # Instagram web app ID
+
+# Chromium launch flags and context settings used by every Playwright flow
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions'
+]
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1280, 'height': 720},
+    'user_agent': USER_AGENT
+}
+
+# Init script that clicks Instagram's cookie banner and "Not now" prompts as soon
+# as they render, so login flows never wait on them. Install it per context with
+# add_init_script before the first navigation.
+DISMISS_POPUPS_SCRIPT = """(() => {
+    const labels = new Set(['Allow all cookies', 'Allow essential and optional cookies', 'Not now', 'Not Now']);
+    let queued = false;
+    const dismiss = () => {
+        queued = false;
+        for (const button of document.querySelectorAll('button, div[role="button"]')) {
+            if (labels.has((button.innerText || '').trim())) button.click();
+        }
+    };
+    new MutationObserver(() => {
+        if (!queued) {
+            queued = true;
+            setTimeout(dismiss, 100);
+        }
+    }).observe(document, { childList: true, subtree: true });
+})();"""
+
+# Resource types scraping pages never need; aborting them cuts page weight a lot
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Third-party analytics/tracking hosts that are aborted alongside the heavy assets
+BLOCKED_URL_PARTS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'connect.facebook.net')
@@ -0,0 +1,37 @@
+"""Lightweight Instagram HTTP helpers that reuse saved session cookies without a browser."""
+from typing import List, Dict, Optional
+import httpx
+from .instagram_common import IG_APP_ID, USER_AGENT
+
+PROFILE_INFO_URL = 'https://www.instagram.com/api/v1/users/web_profile_info/'
+
+
+def _client(cookies: List[Dict]) -> httpx.AsyncClient:
+    """Create an HTTP client carrying the session cookies and web app headers."""
+    return httpx.AsyncClient(
+        cookies={cookie['name']: cookie['value'] for cookie in cookies},
+        headers={'User-Agent': USER_AGENT, 'X-IG-App-ID': IG_APP_ID},
+        timeout=10.0
+    )
+
+
+async def fetch_profile_info(username: str, cookies: List[Dict]) -> Optional[Dict]:
+    """Fetch a profile's JSON (``data.user``) using the session cookies.
+
+    Returns None if the session was rejected or the response was not usable.
+    """
+    try:
+        async with _client(cookies) as client:
+            response = await client.get(PROFILE_INFO_URL, params={'username': username})
+        if response.status_code != 200:
+            return None
+        return response.json().get('data', {}).get('user')
+    except Exception:
+        return None
+
+
+async def check_session(cookies: List[Dict], username: str = 'instagram') -> bool:
+    """Return True if the saved cookies still belong to a logged-in session."""
+    if not any(cookie.get('name') == 'sessionid' for cookie in cookies):
+        return False
+    return await fetch_profile_info(username, cookies) is not None
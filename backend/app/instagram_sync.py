@@ -1,21 +1,44 @@
 """Instagram automation using Playwright (Synchronous API for Windows compatibility)."""
+import atexit
 import random
 import sys
 import os
 import json
+import queue
+import re
+import threading
 import httpx
-from typing import Dict
-from playwright.sync_api import sync_playwright
+import orjson
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Optional, Tuple
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 import time
+from .config import settings
+from .instagram_http import PROFILE_INFO_URL
+from .instagram_common import BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PARTS, CONTEXT_OPTIONS, DISMISS_POPUPS_SCRIPT, IG_APP_ID, LAUNCH_ARGS, USER_AGENT
 
-# Create log file for this session
-_log_file = None
+# Create log file for this session (kept open; executor threads share it under a lock).
+# Writes go to an 8 KB buffer that a background thread flushes about once a second.
+_log_fp = None
+_log_lock = threading.Lock()
+_LOG_FLUSH_INTERVAL = 1.0
+
+def _flush_log():
+    """Flush buffered log lines to disk."""
+    with _log_lock:
+        if _log_fp is not None and not _log_fp.closed:
+            _log_fp.flush()
+
+def _flush_log_periodically():
+    while True:
+        time.sleep(_LOG_FLUSH_INTERVAL)
+        _flush_log()
 
 def _get_log_file():
-    """Get or create the log file for this Playwright session."""
-    global _log_file
-    if _log_file is None:
+    """Get or open the buffered log file handle for this Playwright session."""
+    global _log_fp
+    if _log_fp is None:
         log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
         os.makedirs(log_dir, exist_ok=True)
         # Also ensure debug directory exists
@@ -25,103 +48,400 @@ def _get_log_file():
         api_logs_dir = os.path.join(log_dir, 'api_logs')
         os.makedirs(api_logs_dir, exist_ok=True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        _log_file = os.path.join(log_dir, f'playwright_{timestamp}.log')
-    return _log_file
+        _log_fp = open(os.path.join(log_dir, f'playwright_{timestamp}.log'), 'a', encoding='utf-8', buffering=8192)
+        atexit.register(_log_fp.close)
+        threading.Thread(target=_flush_log_periodically, name='log-flush', daemon=True).start()
+    return _log_fp
 
 def _log(message: str):
     """Log message to both stdout and file."""
     print(message)
     sys.stdout.flush()
     try:
-        with open(_get_log_file(), 'a', encoding='utf-8') as f:
-            f.write(f"{message}\n")
+        with _log_lock:
+            _get_log_file().write(f"{message}\n")
     except:
         pass
 
 
-def _log_api_response(endpoint_type: str, response_data: dict):
-    """Log Instagram API response to a separate file for analysis."""
+# API responses are only recorded when LOG_API_RESPONSES is set. Serializing and writing
+# happen on a background thread, one compact JSON line per response, into one file per
+# endpoint type for this session
+_API_LOG_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs', 'api_logs')
+_API_LOG_SESSION = datetime.now().strftime('%Y%m%d_%H%M%S')
+_api_log_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-log')
+
+
+def _append_api_log(endpoint_type: str, response_data: dict):
     try:
-        log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs', 'api_logs')
-        os.makedirs(log_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        filename = os.path.join(log_dir, f'{endpoint_type}_{timestamp}.json')
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(response_data, f, indent=2, ensure_ascii=False)
-        _log(f"[API] Logged {endpoint_type} response to: {filename}")
+        filename = os.path.join(_API_LOG_DIR, f'{endpoint_type}_{_API_LOG_SESSION}.jsonl')
+        with open(filename, 'ab') as f:
+            f.write(orjson.dumps(response_data) + b'\n')
     except Exception as e:
         _log(f"[API] Failed to log response: {e}")
 
 
-def _create_browser_context(playwright, headless: bool = False):
-    """Create a browser context with common settings."""
-    browser = playwright.chromium.launch(
-        headless=headless,
-        args=['--disable-blink-features=AutomationControlled']
-    )
-    context = browser.new_context(
-        viewport={'width': 1280, 'height': 720},
-        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    )
-    return browser, context
+def _log_api_response(endpoint_type: str, response_data: dict):
+    """Queue an Instagram API response for the api_logs file of its endpoint type."""
+    if settings.log_api_responses:
+        _api_log_writer.submit(_append_api_log, endpoint_type, response_data)
+
+
+# Debug screenshots are opt-in (DEBUG_SCREENSHOTS) and rate limited, viewport-only JPEGs,
+# and are written on a background thread so failure storms don't serialize on disk writes
+_DEBUG_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs', 'debug')
+_SCREENSHOT_INTERVAL = 5.0
+_last_screenshot = 0.0
+_screenshot_lock = threading.Lock()
+_screenshot_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshot')
+
+
+def _write_file(path: str, data: bytes):
+    try:
+        with open(path, 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        _log(f"[PLAYWRIGHT] Failed to write screenshot {path}: {e}")
+
+
+def _debug_screenshot(page, name: str) -> Optional[str]:
+    """Capture a debug screenshot named ``name`` if enabled and not taken in the last few seconds.
+    
+    Returns the path the screenshot is being written to, or None if skipped.
+    """
+    global _last_screenshot
+    if not settings.debug_screenshots:
+        return None
+    with _screenshot_lock:
+        now = time.monotonic()
+        if now - _last_screenshot < _SCREENSHOT_INTERVAL:
+            return None
+        _last_screenshot = now
+    try:
+        image = page.screenshot(type='jpeg', quality=60)
+    except Exception as e:
+        _log(f"[PLAYWRIGHT] Failed to take screenshot: {e}")
+        return None
+    os.makedirs(_DEBUG_DIR, exist_ok=True)
+    path = os.path.join(_DEBUG_DIR, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg")
+    _screenshot_writer.submit(_write_file, path, image)
+    _log(f"[PLAYWRIGHT] Screenshot saved to: {path}")
+    return path
+
+
+# Reads every user row out of the open dialog and then scrolls its list container,
+# so each scroll iteration costs one round-trip instead of one for reading plus one for scrolling.
+# Installed once per context as window.__igScrollExtract so the loop only sends a short call.
+_SCROLL_AND_EXTRACT_SCRIPT = """(() => {
+    // Profile links only - post, reel, explore and other app routes are filtered out by
+    // the browser's selector engine before any of them reach the loop below
+    const NON_PROFILE_PATHS = ['explore', 'p', 'reel', 'reels', 'stories', 'accounts', 'direct'];
+    const USER_LINKS = 'a[href^="/"]:not([data-ig-read]):not([href*="/p/"]):not([href*="/tagged/"])'
+        + NON_PROFILE_PATHS.map(path => `:not([href^="/${path}/"])`).join('');
+    window.__igScrollExtract = () => {
+        const dialog = document.querySelector('div[role="dialog"]');
+        if (!dialog) return { success: false, error: 'Dialog not found', users: [] };
+    
+        // Collect the rows rendered since the last scroll before moving the list again.
+        // Links are tagged once read, so each call only serializes rows that are new to
+        // the page. Avatar and name both link to the profile, so keep only the first link per user.
+        // When the dialog holds exactly as many links as on the previous call nothing new
+        // has rendered, so the row scan is skipped entirely.
+        const users = [];
+        const seen = new Set();
+        const linkCount = dialog.querySelectorAll('a[href^="/"]').length;
+        const unchanged = dialog === window.__igLastDialog && linkCount === window.__igLastLinkCount;
+        window.__igLastDialog = dialog;
+        window.__igLastLinkCount = linkCount;
+        for (const a of unchanged ? [] : dialog.querySelectorAll(USER_LINKS)) {
+            a.setAttribute('data-ig-read', '');
+            // First path segment without building intermediate arrays
+            const href = a.getAttribute('href');
+            const end = href.indexOf('/', 1);
+            const username = end === -1 ? href.slice(1) : href.slice(1, end);
+            if (!username || seen.has(username)) continue;
+            seen.add(username);
+            const row = a.parentElement?.parentElement;
+            users.push({
+                username: username,
+                full_name: row?.querySelector('span')?.innerText || '',
+                is_verified: !!row?.querySelector('svg[aria-label="Verified"]'),
+                profile_pic_url: a.querySelector('img')?.getAttribute('src') || ''
+            });
+        }
+    
+        // Reuse the container found on an earlier scroll unless Instagram has re-rendered it
+        let bestDiv = window.__igScrollDiv;
+        let maxLinks = 0;
+        let method = 'cached';
+        let totalDivs = 0;
+    
+        if (!bestDiv || !dialog.contains(bestDiv)) {
+            bestDiv = null;
+            method = 'find by links';
+            const divs = Array.from(dialog.querySelectorAll('div'));
+            totalDivs = divs.length;
+        
+            // Find the div with the most user links - that's our scrollable container.
+            // One pass: layout is read first so divs that can't scroll skip the link count,
+            // and the first scrollable div is kept in case none holds links yet.
+            let firstScrollable = null;
+            for (let div of divs) {
+                if (div.scrollHeight <= div.clientHeight) continue;
+                if (!firstScrollable) firstScrollable = div;
+                const links = div.querySelectorAll('a[href^="/"]').length;
+                if (links > maxLinks) {
+                    maxLinks = links;
+                    bestDiv = div;
+                }
+            }
+            if (!bestDiv && firstScrollable) {
+                method = 'first scrollable';
+                bestDiv = firstScrollable;
+            }
+        
+            window.__igScrollDiv = bestDiv;
+        }
+    
+        if (!bestDiv) {
+            return {
+                success: false,
+                error: 'No scrollable div found',
+                totalDivs: totalDivs,
+                maxLinksFound: maxLinks,
+                linkCount: linkCount,
+                users: users
+            };
+        }
+    
+        const beforeScroll = bestDiv.scrollTop;
+        bestDiv.scrollTop = bestDiv.scrollHeight;
+        const afterScroll = bestDiv.scrollTop;
+    
+        return {
+            success: true,
+            scrolled: afterScroll > beforeScroll,
+            beforeScroll: beforeScroll,
+            afterScroll: afterScroll,
+            scrollHeight: bestDiv.scrollHeight,
+            clientHeight: bestDiv.clientHeight,
+            linksFound: maxLinks,
+            method: method,
+            linkCount: linkCount,
+            users: users
+        };
+    };
+})();"""
+
+
+def _wait_for_list_ready(page, timeout: int = 10000) -> bool:
+    """Wait until the open dialog has rendered its user rows (or its scrollable list)."""
+    try:
+        page.wait_for_function(
+            """() => {
+                const dialog = document.querySelector('div[role="dialog"]');
+                if (!dialog) return false;
+                for (const div of dialog.querySelectorAll('div')) {
+                    if (div.scrollHeight > div.clientHeight && div.querySelector('a[href^="/"]')) return true;
+                }
+                return !!dialog.querySelector('a[href^="/"] img');
+            }""",
+            timeout=timeout
+        )
+        return True
+    except Exception:
+        return False
+
+
+def _wait_for_new_rows(page, link_count: int, timeout: int = 3000):
+    """Wait until the dialog holds more user links than link_count, or give up after timeout ms."""
+    try:
+        page.wait_for_function(
+            """(count) => {
+                const dialog = document.querySelector('div[role="dialog"]');
+                return !!dialog && dialog.querySelectorAll('a[href^="/"]').length > count;
+            }""",
+            arg=link_count,
+            timeout=timeout
+        )
+    except Exception:
+        # Nothing new rendered - the no-new-users counter decides when to stop
+        pass
+
+
+def _launch_browser(playwright, headless: bool = False):
+    """Launch Chromium with common settings."""
+    return playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+
+
+# Default wait for element actions in every sync context
+DEFAULT_TIMEOUT_MS = 10000
+
+# Storage state saved after login (shared with the async bot's sessions directory)
+_STATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sessions')
+
+
+# The unfollow flow clicks through Instagram's menus, so it keeps stylesheets for layout
+UNFOLLOW_BLOCKED_TYPES = BLOCKED_RESOURCE_TYPES - {'stylesheet'}
+
+
+def _abort_heavy_assets(route, blocked_types: frozenset = BLOCKED_RESOURCE_TYPES):
+    """Route handler that aborts requests for assets and trackers scraping doesn't need."""
+    request = route.request
+    if request.resource_type in blocked_types or any(part in request.url for part in BLOCKED_URL_PARTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _new_context(browser, block_assets: bool = False, storage_state: Optional[Dict] = None,
+                 blocked_types: frozenset = BLOCKED_RESOURCE_TYPES):
+    """Create a browser context with common settings.
+    
+    Callers that don't need the full page pass block_assets=True to skip
+    ``blocked_types`` (images, media, fonts and stylesheets by default) and
+    analytics requests, unless disabled via SCRAPE_BLOCK_ASSETS.
+    """
+    context = browser.new_context(storage_state=storage_state, **CONTEXT_OPTIONS)
+    # Clicks, fills and selector waits give up well before Playwright's 30s default;
+    # navigations still pass their own explicit timeout
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    if block_assets and settings.scrape_block_assets:
+        context.route('**/*', lambda route: _abort_heavy_assets(route, blocked_types))
+    return context
+
+
+def _cookie_value(cookies: list, name: str) -> Optional[str]:
+    """Return the value of the named cookie, if present."""
+    for cookie in cookies:
+        if cookie.get('name') == name:
+            return cookie.get('value')
+    return None
+
+
+def _state_path(session_cookies: list) -> Optional[str]:
+    """Path of the saved storage state for the account that owns these cookies."""
+    user_id = _cookie_value(session_cookies, 'ds_user_id')
+    return os.path.join(_STATE_DIR, f'id_{user_id}.json') if user_id else None
+
+
+def _load_session_state(session_cookies: list) -> Optional[Dict]:
+    """Read the login's saved storage state if it still belongs to this session, else None."""
+    path = _state_path(session_cookies)
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            if _cookie_value(state.get('cookies', []), 'sessionid') == _cookie_value(session_cookies, 'sessionid'):
+                return state
+        except Exception as e:
+            _log(f"[PLAYWRIGHT] Could not restore storage state: {e}")
+    return None
+
+
+def _session_context(browser, session_cookies: list, block_assets: bool = False,
+                     blocked_types: frozenset = BLOCKED_RESOURCE_TYPES, state: Optional[Dict] = None):
+    """Create a logged-in context, restoring the login's full storage state when it still matches.
+    
+    The state saved by instagram_login also carries localStorage, so Instagram
+    skips re-establishing the device/CSRF state on the first navigation. Falls
+    back to injecting the raw cookies when there is no state for this session.
+    Callers opening several contexts for one session can pass the already
+    loaded ``state``.
+    """
+    if state is None:
+        state = _load_session_state(session_cookies)
+    if state is not None:
+        _log("[PLAYWRIGHT] Restoring saved storage state...")
+        return _new_context(browser, block_assets, storage_state=state, blocked_types=blocked_types)
+    
+    context = _new_context(browser, block_assets, blocked_types=blocked_types)
+    _log(f"[PLAYWRIGHT] Loading {len(session_cookies)} session cookies...")
+    context.add_cookies(session_cookies)
+    return context
+
+
+class BrowserPool:
+    """Keeps Playwright and Chromium running between calls.
+    
+    Sync Playwright objects can only be used from the thread that created them,
+    so every executor thread lazily starts its own driver and browser and reuses
+    them; callers only create and dispose of contexts.
+    """
+    
+    _local = threading.local()
+    
+    @classmethod
+    def get_browser(cls, headless: bool = False):
+        """Return this thread's browser for the given mode, launching it if needed."""
+        state = cls._local
+        if getattr(state, 'playwright', None) is None:
+            _log("[PLAYWRIGHT] Starting pooled Playwright driver...")
+            state.playwright = sync_playwright().start()
+            state.browsers = {}
+        
+        browser = state.browsers.get(headless)
+        if browser is None or not browser.is_connected():
+            _log(f"[PLAYWRIGHT] Launching pooled browser (headless={headless})...")
+            browser = _launch_browser(state.playwright, headless)
+            state.browsers[headless] = browser
+        return browser
+    
+    @classmethod
+    def shutdown(cls):
+        """Close this thread's browsers and stop its Playwright driver."""
+        state = cls._local
+        if getattr(state, 'playwright', None) is None:
+            return
+        for browser in state.browsers.values():
+            try:
+                browser.close()
+            except:
+                pass
+        try:
+            state.playwright.stop()
+        except:
+            pass
+        state.playwright = None
+        state.browsers = {}
 
 
 def instagram_login(username: str, password: str, headless: bool = False) -> Dict:
     """Login to Instagram using synchronous Playwright in a single function."""
-    playwright = None
-    browser = None
+    context = None
     
     try:
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
+        browser = BrowserPool.get_browser(headless)
+        context = _new_context(browser)
+        context.add_init_script(DISMISS_POPUPS_SCRIPT)
         page = context.new_page()
         
         _log("[PLAYWRIGHT] Navigating to Instagram login page...")
-        page.goto('https://www.instagram.com/accounts/login/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(random.uniform(3, 5))
-        
-        # Handle cookie consent if present
-        try:
-            _log("[PLAYWRIGHT] Checking for cookie consent...")
-            cookie_button = page.locator('button:has-text("Allow all cookies"), button:has-text("Allow essential and optional cookies")')
-            if cookie_button.is_visible(timeout=5000):
-                _log("[PLAYWRIGHT] Accepting cookies...")
-                cookie_button.first.click()
-                time.sleep(2)
-        except Exception as e:
-            _log(f"[PLAYWRIGHT] No cookie consent or error: {e}")
-            pass
+        # The form wait below is the readiness signal, so only wait for the response to commit
+        page.goto('https://www.instagram.com/accounts/login/', wait_until='commit', timeout=30000)
         
         # Wait for login form with multiple possible selectors
         _log("[PLAYWRIGHT] Waiting for login form...")
-        username_selector = None
-        password_selector = None
         
-        # Try different selectors Instagram might use
+        # Try different selectors Instagram might use - joined into one union so the
+        # browser resolves whichever renders first in a single wait
         possible_username_selectors = [
             'input[name="username"]',
-            'input[type="text"]',
             'input[autocomplete="username"]',
             'input[aria-label*="username" i]',
-            'input[placeholder*="username" i]'
+            'input[placeholder*="username" i]',
+            'input[type="text"]'
         ]
         
-        for selector in possible_username_selectors:
-            try:
-                if page.locator(selector).is_visible(timeout=5000):
-                    username_selector = selector
-                    _log(f"[PLAYWRIGHT] Found username input with selector: {selector}")
-                    break
-            except:
-                continue
-        
-        if not username_selector:
+        try:
+            username_input = page.wait_for_selector(', '.join(possible_username_selectors), state='visible', timeout=15000)
+            _log("[PLAYWRIGHT] Found username input")
+        except Exception:
             _log(f"[PLAYWRIGHT] Could not find username input. Current URL: {page.url}")
             _log(f"[PLAYWRIGHT] Page title: {page.title()}")
-            screenshot_path = f"c:/GitHub/johnapaez/instagram-tool/backend/logs/debug/login_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            page.screenshot(path=screenshot_path)
-            _log(f"[PLAYWRIGHT] Screenshot saved to: {screenshot_path}")
-            raise Exception(f"Could not find username input field. Check screenshot at {screenshot_path}")
+            screenshot_path = _debug_screenshot(page, 'login_error')
+            hint = f" Check screenshot at {screenshot_path}" if screenshot_path else ""
+            raise Exception(f"Could not find username input field.{hint}")
         
         # Find password field
         possible_password_selectors = [
@@ -130,30 +450,23 @@ def instagram_login(username: str, password: str, headless: bool = False) -> Dic
             'input[autocomplete="current-password"]'
         ]
         
-        for selector in possible_password_selectors:
-            try:
-                if page.locator(selector).is_visible(timeout=2000):
-                    password_selector = selector
-                    _log(f"[PLAYWRIGHT] Found password input with selector: {selector}")
-                    break
-            except:
-                continue
-        
-        if not password_selector:
+        try:
+            password_input = page.wait_for_selector(', '.join(possible_password_selectors), state='visible', timeout=5000)
+            _log("[PLAYWRIGHT] Found password input")
+        except Exception:
             raise Exception("Could not find password input field")
         
         # Fill login form
         _log(f"[PLAYWRIGHT] Filling username: {username}")
-        page.fill(username_selector, username)
+        username_input.fill(username)
         time.sleep(random.uniform(1, 2))
         
         _log("[PLAYWRIGHT] Filling password...")
-        page.fill(password_selector, password)
+        password_input.fill(password)
         time.sleep(random.uniform(1, 2))
         
         # Find and click login button
         _log("[PLAYWRIGHT] Finding login button...")
-        login_button_selector = None
         
         possible_button_selectors = [
             'button[type="submit"]',
@@ -164,27 +477,30 @@ def instagram_login(username: str, password: str, headless: bool = False) -> Dic
             'button._acan._acap._acas'
         ]
         
-        for selector in possible_button_selectors:
-            try:
-                if page.locator(selector).is_visible(timeout=2000):
-                    login_button_selector = selector
-                    _log(f"[PLAYWRIGHT] Found login button with selector: {selector}")
-                    break
-            except:
-                continue
+        try:
+            login_button = page.wait_for_selector(', '.join(possible_button_selectors), state='visible', timeout=5000)
+        except Exception:
+            login_button = None
         
-        if not login_button_selector:
+        if not login_button:
             _log("[PLAYWRIGHT] Could not find login button, trying to press Enter instead...")
             # Alternative: press Enter key on password field
-            page.locator(password_selector).press('Enter')
+            password_input.press('Enter')
             _log("[PLAYWRIGHT] Pressed Enter on password field")
         else:
             _log("[PLAYWRIGHT] Clicking login button...")
-            page.click(login_button_selector)
+            login_button.click()
         
-        # Wait for navigation
+        # Wait until we either leave the login page or an error is shown
         _log("[PLAYWRIGHT] Waiting for login to complete...")
-        time.sleep(5)
+        try:
+            page.wait_for_function(
+                """() => !location.pathname.startsWith('/accounts/login')
+                    || !!document.querySelector('p[data-testid="login-error-message"]')""",
+                timeout=15000
+            )
+        except Exception as e:
+            _log(f"[PLAYWRIGHT] Login did not settle: {e}")
         
         # Check for errors
         try:
@@ -192,8 +508,6 @@ def instagram_login(username: str, password: str, headless: bool = False) -> Dic
             if error_element:
                 error_text = error_element.inner_text()
                 _log(f"[PLAYWRIGHT] Login error: {error_text}")
-                browser.close()
-                playwright.stop()
                 return {'success': False, 'error': error_text}
         except:
             pass
@@ -202,38 +516,17 @@ def instagram_login(username: str, password: str, headless: bool = False) -> Dic
         current_url = page.url
         _log(f"[PLAYWRIGHT] Current URL: {current_url}")
         
-        # Handle "Save Your Login Info" prompt
-        try:
-            not_now_button = page.locator('button:has-text("Not now")')
-            if not_now_button.is_visible(timeout=3000):
-                _log("[PLAYWRIGHT] Dismissing save login info prompt...")
-                not_now_button.click()
-                time.sleep(2)
-        except:
-            pass
-        
-        # Handle notifications prompt
-        try:
-            not_now_button = page.locator('button:has-text("Not Now")')
-            if not_now_button.is_visible(timeout=3000):
-                _log("[PLAYWRIGHT] Dismissing notifications prompt...")
-                not_now_button.click()
-                time.sleep(2)
-        except:
-            pass
-        
         # Check if login was successful
         if 'instagram.com' in current_url and '/accounts/login' not in current_url:
             _log("[PLAYWRIGHT] Login successful!")
             
-            # Save cookies
+            # Save cookies, plus full storage state so later contexts can be restored from it
             cookies = context.cookies()
-            
-            # Close browser
-            page.close()
-            context.close()
-            browser.close()
-            playwright.stop()
+            try:
+                os.makedirs(_STATE_DIR, exist_ok=True)
+                context.storage_state(path=_state_path(cookies))
+            except Exception as e:
+                _log(f"[PLAYWRIGHT] Could not save storage state: {e}")
             
             return {
                 'success': True,
@@ -242,668 +535,593 @@ def instagram_login(username: str, password: str, headless: bool = False) -> Dic
             }
         else:
             _log("[PLAYWRIGHT] Login failed - still on login page")
-            browser.close()
-            playwright.stop()
             return {'success': False, 'error': 'Login failed - please check credentials or complete 2FA manually'}
             
     except Exception as e:
         _log(f"[PLAYWRIGHT] Exception: {str(e)}")
-        if browser:
-            browser.close()
-        if playwright:
-            playwright.stop()
         return {'success': False, 'error': str(e)}
+    finally:
+        # Only the context is disposed; the pooled browser stays warm
+        if context:
+            try:
+                context.close()
+            except:
+                pass
 
 
-def instagram_get_followers(username: str, session_cookies: list, limit: int = 500, headless: bool = False) -> Dict:
-    """Fetch followers list using sync Playwright."""
-    playwright = None
-    browser = None
+def _api_user(user: Dict) -> Dict:
+    """Shape one user record from Instagram's friendships API like the rest of the scrapers."""
+    return {
+        'username': user.get('username'),
+        'full_name': user.get('full_name', ''),
+        'is_verified': user.get('is_verified', False),
+        'profile_pic_url': user.get('profile_pic_url', ''),
+        'user_id': user.get('pk', ''),
+        'is_private': user.get('is_private', False),
+        'has_anonymous_profile_picture': user.get('has_anonymous_profile_picture', False),
+        'latest_reel_media': user.get('latest_reel_media', 0)
+    }
+
+
+def _scrape_follow_list(username: str, session_cookies: list, kind: str, limit: int, headless: bool) -> Dict:
+    """Scroll a profile's followers or following dialog and collect every user in it.
+    
+    ``kind`` is ``'followers'`` or ``'following'``; it picks the profile link to open
+    and the key the users are returned under.
+    """
+    context = None
+    page = None
+    label = kind.capitalize()
     
     try:
-        _log(f"[PLAYWRIGHT] Starting followers fetch for {username}...")
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
-        
-        # Load session cookies
-        _log(f"[PLAYWRIGHT] Loading {len(session_cookies)} session cookies...")
-        context.add_cookies(session_cookies)
+        _log(f"[PLAYWRIGHT] Starting {kind} fetch for {username}...")
+        browser = BrowserPool.get_browser(headless)
+        # Load the session (saved storage state, or the raw cookies)
+        context = _session_context(browser, session_cookies, block_assets=True)
+        context.add_init_script(_SCROLL_AND_EXTRACT_SCRIPT)
         
         page = context.new_page()
         
-        # Set up network interception to capture API calls
-        api_responses = []
+        # Set up network interception: the list pages Instagram fetches while the dialog
+        # scrolls carry the full user records, so they are used ahead of the rendered rows
+        captured = []
         
         def handle_response(response):
             """Capture Instagram API responses."""
             url = response.url
-            # Look for GraphQL or API endpoints related to followers
-            if 'graphql/query' in url or '/api/v1/' in url:
-                if 'followers' in url.lower() or 'follow' in url.lower():
-                    try:
-                        response_body = response.json()
-                        _log(f"[API] Captured followers API call: {url[:100]}...")
-                        _log_api_response('followers', {
-                            'url': url,
-                            'status': response.status,
-                            'data': response_body
-                        })
-                        api_responses.append(response_body)
-                    except Exception as e:
-                        _log(f"[API] Could not parse response: {e}")
+            # Look for GraphQL or API endpoints related to followers/following (cheap URL checks first)
+            if ('graphql/query' not in url and '/api/v1/' not in url) or 'follow' not in url.lower():
+                return
+            # Don't buffer bodies that can't be the JSON list pages (HTML, media, errors)
+            content_type = response.headers.get('content-type', '')
+            if 'json' not in content_type and 'javascript' not in content_type:
+                return
+            try:
+                response_body = orjson.loads(response.body())
+            except orjson.JSONDecodeError:
+                return
+            except Exception as e:
+                _log(f"[API] Could not read response: {e}")
+                return
+            try:
+                _log(f"[API] Captured {kind} API call: {url[:100]}...")
+                _log_api_response(kind, {
+                    'url': url,
+                    'status': response.status,
+                    'data': response_body
+                })
+                captured.extend(_api_user(user) for user in response_body.get('users', []) if user.get('username'))
+            except Exception as e:
+                _log(f"[API] Could not parse response: {e}")
         
         page.on("response", handle_response)
         
         # Navigate to profile
         _log(f"[PLAYWRIGHT] Navigating to profile: {username}")
-        page.goto(f'https://www.instagram.com/{username}/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(random.uniform(1, 2))
+        # The link wait below is the readiness signal, so only wait for the response to commit
+        page.goto(f'https://www.instagram.com/{username}/', wait_until='commit', timeout=30000)
         
-        # Click followers link
-        _log(f"[PLAYWRIGHT] Looking for followers link...")
-        followers_link = page.locator(f'a[href="/{username}/followers/"]')
-        if not followers_link.is_visible(timeout=5000):
-            raise Exception("Followers link not found - session may have expired")
+        # Click followers/following link
+        _log(f"[PLAYWRIGHT] Looking for {kind} link...")
+        list_link = page.locator(f'a[href="/{username}/{kind}/"]').first
+        try:
+            list_link.wait_for(state='visible', timeout=15000)
+        except PlaywrightTimeoutError:
+            raise Exception(f"{label} link not found - session may have expired")
         
-        followers_link.first.click()
-        _log(f"[PLAYWRIGHT] Clicked followers link, waiting for dialog...")
-        time.sleep(1)
+        list_link.click()
+        _log(f"[PLAYWRIGHT] Clicked {kind} link, waiting for dialog...")
         
         # Get the dialog and find the scrollable container
         _log(f"[PLAYWRIGHT] Looking for dialog...")
         dialog = page.locator('div[role="dialog"]')
-        if not dialog.is_visible(timeout=5000):
-            raise Exception("Followers dialog did not appear")
+        try:
+            dialog.first.wait_for(state='visible', timeout=5000)
+        except PlaywrightTimeoutError:
+            raise Exception(f"{label} dialog did not appear")
         
         # Find the scrollable div inside the dialog - this is the key!
-        # Instagram puts followers in a scrollable div with specific class/style
-        _log(f"[PLAYWRIGHT] Finding scrollable container...")
-        
-        # Wait for Instagram to fully set up the scrollable container
-        time.sleep(2)
-        
-        # Verify the scrollable div exists by checking
-        scrollable_check = page.evaluate('''() => {
-            const dialog = document.querySelector('div[role="dialog"]');
-            if (!dialog) return { found: false, reason: 'no dialog' };
-            
-            const divs = dialog.querySelectorAll('div');
-            for (let div of divs) {
-                const style = window.getComputedStyle(div);
-                const overflow = style.overflow || style.overflowY;
-                if ((overflow === 'auto' || overflow === 'scroll') && div.scrollHeight > div.clientHeight) {
-                    return { 
-                        found: true, 
-                        overflow: overflow,
-                        scrollHeight: div.scrollHeight,
-                        clientHeight: div.clientHeight
-                    };
-                }
-            }
-            return { found: false, reason: 'no scrollable div', totalDivs: divs.length };
-        }''')
-        
-        _log(f"[PLAYWRIGHT] Scrollable container check: {scrollable_check}")
+        # Instagram puts the users in a scrollable div with specific class/style
+        _log(f"[PLAYWRIGHT] Waiting for scrollable container...")
+        if not _wait_for_list_ready(page):
+            _log(f"[PLAYWRIGHT] WARNING: {label} rows did not render in time, scrolling anyway")
         
-        _log(f"[PLAYWRIGHT] Dialog opened, starting to collect ALL followers...")
+        _log(f"[PLAYWRIGHT] Dialog opened, starting to collect ALL {kind}...")
         _log(f"[PLAYWRIGHT] This may take a while for large lists - will scroll until complete!")
         
-        followers = []
-        seen_usernames = set()
+        users = {}  # username -> user, in the order they were collected
+        captured_read = 0
         scroll_attempts = 0
         no_new_users_count = 0
         max_no_new_scrolls = 5  # Stop after 5 consecutive scrolls with no new users
         
         _log(f"[PLAYWRIGHT] Starting scroll loop for {username}...")
         
-        # Scroll and collect followers - NO HARD LIMIT, get everything!
+        # Scroll and collect users until the list ends or the limit is reached
         while True:
             scroll_attempts += 1
-            previous_count = len(followers)
+            previous_count = len(users)
             
-            # Get current users in the dialog
-            user_links = dialog.locator('a[href^="/"]').all()
-            
-            for link in user_links:
-                try:
-                    href = link.get_attribute('href')
-                    if not href:
-                        continue
-                    
-                    # Extract username from href
-                    username_from_href = href.strip('/').split('/')[0]
-                    
-                    # OPTIMIZATION: Skip if we've already processed this user
-                    if not username_from_href or username_from_href in seen_usernames:
-                        continue
-                    
-                    # Mark as seen immediately to avoid reprocessing
-                    seen_usernames.add(username_from_href)
-                    
-                    # Only do expensive DOM operations for NEW users
-                    full_name = ""
-                    is_verified = False
-                    profile_pic_url = ""
-                    
-                    try:
-                        # Look for parent container
-                        parent = link.locator('xpath=../..')
-                        spans = parent.locator('span').all()
-                        if len(spans) > 0:
-                            full_name = spans[0].inner_text()
-                    except:
-                        pass
-                    
-                    try:
-                        # Check for verified badge
-                        verified_count = link.locator('xpath=../..').locator('svg[aria-label="Verified"]').count()
-                        is_verified = verified_count > 0
-                    except:
-                        pass
-                    
-                    try:
-                        # Get profile picture URL
-                        img = link.locator('img').first
-                        if img:
-                            profile_pic_url = img.get_attribute('src') or ""
-                    except:
-                        pass
-                    
-                    followers.append({
-                        'username': username_from_href,
-                        'full_name': full_name,
-                        'is_verified': is_verified,
-                        'profile_pic_url': profile_pic_url
-                    })
-                except Exception as e:
-                    # Skip problematic elements
-                    continue
+            # Read the current users and scroll the list in one evaluate
+            scroll_result = page.evaluate('() => window.__igScrollExtract()')
+            # Captured API records first, then any rendered rows they didn't cover
+            batch = captured[captured_read:] + scroll_result['users']
+            captured_read = len(captured)
+            for user in batch:
+                users.setdefault(user['username'], user)
             
             # Check if we got new users this scroll
-            new_users_this_scroll = len(followers) - previous_count
+            new_users_this_scroll = len(users) - previous_count
             
             if new_users_this_scroll == 0:
                 no_new_users_count += 1
-                _log(f"[PLAYWRIGHT] No new users this scroll ({no_new_users_count}/{max_no_new_scrolls})... Total: {len(followers)}")
+                _log(f"[PLAYWRIGHT] No new users this scroll ({no_new_users_count}/{max_no_new_scrolls})... Total: {len(users)}")
                 if no_new_users_count >= max_no_new_scrolls:
                     _log(f"[PLAYWRIGHT] Reached end of list after {no_new_users_count} scrolls with no new users")
                     break
             else:
                 no_new_users_count = 0
-                _log(f"[PLAYWRIGHT] +{new_users_this_scroll} new followers (total: {len(followers)}, scroll: {scroll_attempts})")
+                _log(f"[PLAYWRIGHT] +{new_users_this_scroll} new {kind} (total: {len(users)}, scroll: {scroll_attempts})")
+                if limit and len(users) >= limit:
+                    _log(f"[PLAYWRIGHT] Reached limit={limit}, stopping")
+                    break
             
             # Safety check - if we've scrolled 500+ times, something might be wrong
             if scroll_attempts >= 500:
                 _log(f"[PLAYWRIGHT] WARNING: Reached 500 scroll attempts, stopping for safety")
                 break
             
-            # NEW APPROACH: Find the div that contains the most user links and scroll that
-            scroll_result = page.evaluate('''() => {
-                const dialog = document.querySelector('div[role="dialog"]');
-                if (!dialog) return { success: false, error: 'Dialog not found' };
-                
-                const divs = Array.from(dialog.querySelectorAll('div'));
-                
-                // Find the div with the most user links - that's our scrollable container
-                let bestDiv = null;
-                let maxLinks = 0;
-                
-                for (let div of divs) {
-                    const links = div.querySelectorAll('a[href^="/"]').length;
-                    // Only consider divs that are actually taller than their visible area
-                    if (links > maxLinks && div.scrollHeight > div.clientHeight) {
-                        maxLinks = links;
-                        bestDiv = div;
-                    }
-                }
-                
-                if (bestDiv) {
-                    const beforeScroll = bestDiv.scrollTop;
-                    bestDiv.scrollTop = bestDiv.scrollHeight;
-                    const afterScroll = bestDiv.scrollTop;
-                    
-                    return {
-                        success: true,
-                        scrolled: afterScroll > beforeScroll,
-                        beforeScroll: beforeScroll,
-                        afterScroll: afterScroll,
-                        scrollHeight: bestDiv.scrollHeight,
-                        clientHeight: bestDiv.clientHeight,
-                        linksFound: maxLinks,
-                        method: 'find by links'
-                    };
-                }
-                
-                // Fallback: Try by overflow property (original method)
-                for (let div of divs) {
-                    const style = window.getComputedStyle(div);
-                    const overflow = style.overflow || style.overflowY;
-                    
-                    if ((overflow === 'auto' || overflow === 'scroll' || overflow === 'hidden') && 
-                        div.scrollHeight > div.clientHeight) {
-                        const beforeScroll = div.scrollTop;
-                        div.scrollTop = div.scrollHeight;
-                        const afterScroll = div.scrollTop;
-                        return {
-                            success: true,
-                            scrolled: afterScroll > beforeScroll,
-                            beforeScroll: beforeScroll,
-                            afterScroll: afterScroll,
-                            scrollHeight: div.scrollHeight,
-                            method: 'find by overflow'
-                        };
-                    }
-                }
-                
-                return { 
-                    success: false, 
-                    error: 'No scrollable div found',
-                    totalDivs: divs.length,
-                    maxLinksFound: maxLinks
-                };
-            }''')
-            
             # Debug logging
             if scroll_result.get('success'):
                 _log(f"[PLAYWRIGHT] Scroll: {scroll_result.get('beforeScroll')}px to {scroll_result.get('afterScroll')}px (height: {scroll_result.get('scrollHeight')}px, method: {scroll_result.get('method', 'unknown')})")
             else:
                 _log(f"[PLAYWRIGHT] WARNING: Scroll failed - {scroll_result.get('error')} (checked {scroll_result.get('totalDivs', 0)} divs, maxLinks: {scroll_result.get('maxLinksFound', 0)})")
             
-            time.sleep(random.uniform(0.5, 1))
-        
-        _log(f"[PLAYWRIGHT] Finished collecting followers: {len(followers)} total")
+            # Move on as soon as the next batch renders instead of sleeping a fixed time
+            _wait_for_new_rows(page, scroll_result.get('linkCount', 0))
         
-        # Close dialog
-        page.keyboard.press('Escape')
-        time.sleep(1)
+        _log(f"[PLAYWRIGHT] Finished collecting {kind}: {len(users)} total")
+        users = list(users.values())[:limit]
         
-        # Close browser
+        # Close context (the pooled browser stays up)
         page.close()
         context.close()
-        browser.close()
-        playwright.stop()
         
         return {
             'success': True,
-            'followers': followers[:limit],
-            'count': len(followers[:limit])
+            kind: users,
+            'count': len(users)
         }
         
     except Exception as e:
-        _log(f"[PLAYWRIGHT] Exception in get_followers: {str(e)}")
-        if browser:
+        _log(f"[PLAYWRIGHT] Exception in get_{kind}: {str(e)}")
+        if context:
+            if page:
+                _debug_screenshot(page, f'{kind}_error')
             try:
-                screenshot_path = f"c:/GitHub/johnapaez/instagram-tool/backend/logs/debug/followers_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                page.screenshot(path=screenshot_path)
-                _log(f"[PLAYWRIGHT] Error screenshot saved to: {screenshot_path}")
-            except:
+                context.close()
+            except Exception:
                 pass
-            browser.close()
-        if playwright:
-            playwright.stop()
         return {'success': False, 'error': str(e)}
 
 
+def instagram_get_followers(username: str, session_cookies: list, limit: int = 500, headless: bool = False) -> Dict:
+    """Fetch followers list using sync Playwright."""
+    return _scrape_follow_list(username, session_cookies, 'followers', limit, headless)
+
+
 def instagram_get_following(username: str, session_cookies: list, limit: int = 500, headless: bool = False) -> Dict:
     """Fetch following list using sync Playwright."""
-    playwright = None
-    browser = None
+    return _scrape_follow_list(username, session_cookies, 'following', limit, headless)
+
+
+# ============================================================================
+# API-BASED SCRAPERS (Faster, more reliable alternative to HTML scraping)
+# ============================================================================
+
+# Status codes that mean "slow down" rather than "this won't work"
+_THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _api_headers(session_cookies: list) -> Optional[dict]:
+    """Headers for Instagram's private API, built once per scrape; None without a csrftoken cookie."""
+    csrf_token = _cookie_value(session_cookies, 'csrftoken')
+    if not csrf_token:
+        return None
+    return {
+        'x-ig-app-id': IG_APP_ID,
+        'x-asbd-id': '129477',
+        'x-csrftoken': csrf_token,
+        'x-requested-with': 'XMLHttpRequest'
+    }
+
+
+class _Backpressure:
+    """Adaptive pause between paginated API requests, with a circuit breaker.
+    
+    The pause shrinks by 10% after each good page and doubles when Instagram
+    throttles (429/5xx). Rate-limit headers on a good page can stretch it
+    before the budget runs out. After ``max_errors`` throttled pages in a row the
+    breaker opens: one retry after ``cooldown`` seconds, and if that is
+    throttled too the caller gives up.
+    """
+    
+    def __init__(self, delay: float = 0.75, min_delay: float = 0.5, max_delay: float = 30.0,
+                 max_errors: int = 3, cooldown: float = 60.0):
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_errors = max_errors
+        self.cooldown = cooldown
+        self.errors = 0
+        self._last_request = time.monotonic()
+    
+    def wait(self):
+        """Pause until ``delay`` (jittered) has passed since the previous request started.
+        
+        Time already spent on the response and its parsing counts toward the pause,
+        so requests keep an even cadence instead of sleeping the full delay on top.
+        """
+        pause = self._last_request + self.delay * random.uniform(0.8, 1.2) - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        self._last_request = time.monotonic()
+    
+    def on_success(self, headers=None):
+        self.errors = 0
+        self.delay = max(self.min_delay, self.delay * 0.9)
+        if headers is not None:
+            self._apply_rate_limit_headers(headers)
+    
+    def _apply_rate_limit_headers(self, headers):
+        """Slow down when x-ratelimit-remaining says the budget is nearly spent."""
+        try:
+            remaining = int(headers.get('x-ratelimit-remaining'))
+            limit = int(headers.get('x-ratelimit-limit'))
+        except (TypeError, ValueError):
+            return
+        if remaining <= 2 or remaining < limit * 0.1:
+            self.delay = min(self.max_delay, max(self.delay, 60.0 / max(1, remaining)))
     
+    @property
+    def tripped(self) -> bool:
+        """True once the breaker has given up, i.e. Instagram is still throttling after the cooldown."""
+        return self.errors > self.max_errors
+    
+    def on_throttle(self, retry_after: Optional[float] = None) -> bool:
+        """Record a throttled page and sleep before retrying it; False means give up."""
+        self.errors += 1
+        self.delay = min(self.max_delay, self.delay * 2)
+        if self.errors > self.max_errors:
+            return False
+        if self.errors == self.max_errors:
+            _log(f"[API] Throttled {self.errors} times in a row, pausing {self.cooldown:.0f}s before one more try")
+            time.sleep(self.cooldown)
+        else:
+            pause = retry_after if retry_after is not None else self.delay
+            _log(f"[API] Throttled, retrying in {pause:.1f}s")
+            time.sleep(pause)
+        self._last_request = time.monotonic()  # The retry goes out now
+        return True
+
+
+# Pooled HTTP clients, one per Instagram session: keep-alive connections are reused across
+# requests and calls, while each account keeps its own cookie jar
+_http_clients: Dict[str, httpx.Client] = {}
+_http_clients_lock = threading.Lock()
+
+
+def _http_client(session_cookies: list) -> httpx.Client:
+    """Return the pooled HTTP client for this session, creating it with the session cookies."""
+    key = _cookie_value(session_cookies, 'sessionid') or ''
+    with _http_clients_lock:
+        client = _http_clients.get(key)
+        if client is None:
+            client = httpx.Client(
+                http2=True,  # Paginated requests multiplex over one connection
+                cookies={cookie['name']: cookie['value'] for cookie in session_cookies},
+                headers={'User-Agent': USER_AGENT, 'x-ig-app-id': IG_APP_ID},
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                timeout=httpx.Timeout(30.0, connect=10.0)
+            )
+            _http_clients[key] = client
+    return client
+
+
+def close_http_clients():
+    """Close every pooled HTTP client."""
+    with _http_clients_lock:
+        for client in _http_clients.values():
+            client.close()
+        _http_clients.clear()
+
+
+atexit.register(close_http_clients)
+
+
+# Profile user IDs don't change, so lookups are remembered for an hour per process
+_USER_ID_TTL = 3600.0
+_user_ids: Dict[str, Tuple[str, float]] = {}
+_user_ids_lock = threading.Lock()
+
+
+def _cached_user_id(username: str) -> Optional[str]:
+    with _user_ids_lock:
+        entry = _user_ids.get(username)
+    if entry and time.monotonic() - entry[1] < _USER_ID_TTL:
+        return entry[0]
+    return None
+
+
+def _remember_user_id(username: str, user_id: str):
+    with _user_ids_lock:
+        _user_ids[username] = (user_id, time.monotonic())
+
+
+def _forget_user_id(username: str):
+    with _user_ids_lock:
+        _user_ids.pop(username, None)
+
+
+def _resolve_user_id_http(username: str, session_cookies: list,
+                          backpressure: Optional[_Backpressure] = None) -> Optional[str]:
+    """Look up a profile's numeric user ID through web_profile_info, or None if it can't be resolved.
+    
+    With ``backpressure``, throttled lookups back off and retry, and good ones feed its pacing.
+    """
+    user_id = _cached_user_id(username)
+    if user_id:
+        return user_id
     try:
-        _log(f"[PLAYWRIGHT] Starting following fetch for {username}...")
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
-        
-        # Load session cookies
-        _log(f"[PLAYWRIGHT] Loading {len(session_cookies)} session cookies...")
-        context.add_cookies(session_cookies)
-        
-        page = context.new_page()
-        
-        # Set up network interception to capture API calls
-        api_responses = []
-        
-        def handle_response(response):
-            """Capture Instagram API responses."""
-            url = response.url
-            # Look for GraphQL or API endpoints related to following
-            if 'graphql/query' in url or '/api/v1/' in url:
-                if 'following' in url.lower() or 'follow' in url.lower():
-                    try:
-                        response_body = response.json()
-                        _log(f"[API] Captured following API call: {url[:100]}...")
-                        _log_api_response('following', {
-                            'url': url,
-                            'status': response.status,
-                            'data': response_body
-                        })
-                        api_responses.append(response_body)
-                    except Exception as e:
-                        _log(f"[API] Could not parse response: {e}")
-        
-        page.on("response", handle_response)
-        
-        # Navigate to profile
-        _log(f"[PLAYWRIGHT] Navigating to profile: {username}")
-        page.goto(f'https://www.instagram.com/{username}/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(random.uniform(1, 2))
-        
-        # Click following link
-        _log(f"[PLAYWRIGHT] Looking for following link...")
-        following_link = page.locator(f'a[href="/{username}/following/"]')
-        if not following_link.is_visible(timeout=5000):
-            raise Exception("Following link not found - session may have expired")
-        
-        following_link.first.click()
-        _log(f"[PLAYWRIGHT] Clicked following link, waiting for dialog...")
-        time.sleep(1)
-        
-        # Get the dialog and prepare for scrolling
-        _log(f"[PLAYWRIGHT] Looking for dialog...")
-        dialog = page.locator('div[role="dialog"]')
-        if not dialog.is_visible(timeout=5000):
-            raise Exception("Following dialog did not appear")
-        
-        _log(f"[PLAYWRIGHT] Dialog found, waiting for scrollable container to render...")
-        # Wait for Instagram to fully set up the scrollable container
-        time.sleep(2)
-        
-        _log(f"[PLAYWRIGHT] Dialog opened, starting to collect ALL following...")
-        _log(f"[PLAYWRIGHT] This may take a while for large lists - will scroll until complete!")
-        following = []
-        seen_usernames = set()
-        scroll_attempts = 0
-        no_new_users_count = 0
-        max_no_new_scrolls = 5  # Stop after 5 consecutive scrolls with no new users
-        
-        # Scroll and collect following - NO HARD LIMIT, get everything!
+        client = _http_client(session_cookies)
         while True:
-            scroll_attempts += 1
-            previous_count = len(following)
-            
-            # Get current users in the dialog
-            user_links = dialog.locator('a[href^="/"]').all()
-            
-            for link in user_links:
-                try:
-                    href = link.get_attribute('href')
-                    if not href:
-                        continue
-                    
-                    # Extract username from href
-                    username_from_href = href.strip('/').split('/')[0]
-                    
-                    # OPTIMIZATION: Skip if we've already processed this user
-                    if not username_from_href or username_from_href in seen_usernames:
-                        continue
-                    
-                    # Mark as seen immediately to avoid reprocessing
-                    seen_usernames.add(username_from_href)
-                    
-                    # Only do expensive DOM operations for NEW users
-                    full_name = ""
-                    is_verified = False
-                    profile_pic_url = ""
-                    
-                    try:
-                        # Look for parent container
-                        parent = link.locator('xpath=../..')
-                        spans = parent.locator('span').all()
-                        if len(spans) > 0:
-                            full_name = spans[0].inner_text()
-                    except:
-                        pass
-                    
-                    try:
-                        # Check for verified badge
-                        verified_count = link.locator('xpath=../..').locator('svg[aria-label="Verified"]').count()
-                        is_verified = verified_count > 0
-                    except:
-                        pass
-                    
-                    try:
-                        # Get profile picture URL
-                        img = link.locator('img').first
-                        if img:
-                            profile_pic_url = img.get_attribute('src') or ""
-                    except:
-                        pass
-                    
-                    following.append({
-                        'username': username_from_href,
-                        'full_name': full_name,
-                        'is_verified': is_verified,
-                        'profile_pic_url': profile_pic_url
-                    })
-                except Exception as e:
-                    # Skip problematic elements
-                    continue
-            
-            # Check if we got new users this scroll
-            new_users_this_scroll = len(following) - previous_count
-            
-            if new_users_this_scroll == 0:
-                no_new_users_count += 1
-                _log(f"[PLAYWRIGHT] No new users this scroll ({no_new_users_count}/{max_no_new_scrolls})... Total: {len(following)}")
-                if no_new_users_count >= max_no_new_scrolls:
-                    _log(f"[PLAYWRIGHT] Reached end of list after {no_new_users_count} scrolls with no new users")
-                    break
-            else:
-                no_new_users_count = 0
-                _log(f"[PLAYWRIGHT] +{new_users_this_scroll} new following (total: {len(following)}, scroll: {scroll_attempts})")
-            
-            # Safety check - if we've scrolled 500+ times, something might be wrong
-            if scroll_attempts >= 500:
-                _log(f"[PLAYWRIGHT] WARNING: Reached 500 scroll attempts, stopping for safety")
-                break
-            
-            # NEW APPROACH: Find the div that contains the most user links and scroll that
-            scroll_result = page.evaluate('''() => {
-                const dialog = document.querySelector('div[role="dialog"]');
-                if (!dialog) return { success: false, error: 'Dialog not found' };
-                
-                const divs = Array.from(dialog.querySelectorAll('div'));
-                
-                // Find the div with the most user links - that's our scrollable container
-                let bestDiv = null;
-                let maxLinks = 0;
-                
-                for (let div of divs) {
-                    const links = div.querySelectorAll('a[href^="/"]').length;
-                    // Only consider divs that are actually taller than their visible area
-                    if (links > maxLinks && div.scrollHeight > div.clientHeight) {
-                        maxLinks = links;
-                        bestDiv = div;
-                    }
-                }
-                
-                if (bestDiv) {
-                    const beforeScroll = bestDiv.scrollTop;
-                    bestDiv.scrollTop = bestDiv.scrollHeight;
-                    const afterScroll = bestDiv.scrollTop;
-                    
-                    return {
-                        success: true,
-                        scrolled: afterScroll > beforeScroll,
-                        beforeScroll: beforeScroll,
-                        afterScroll: afterScroll,
-                        scrollHeight: bestDiv.scrollHeight,
-                        clientHeight: bestDiv.clientHeight,
-                        linksFound: maxLinks,
-                        method: 'find by links'
-                    };
-                }
-                
-                // Fallback: Try by overflow property (original method)
-                for (let div of divs) {
-                    const style = window.getComputedStyle(div);
-                    const overflow = style.overflow || style.overflowY;
-                    
-                    if ((overflow === 'auto' || overflow === 'scroll' || overflow === 'hidden') && 
-                        div.scrollHeight > div.clientHeight) {
-                        const beforeScroll = div.scrollTop;
-                        div.scrollTop = div.scrollHeight;
-                        const afterScroll = div.scrollTop;
-                        return {
-                            success: true,
-                            scrolled: afterScroll > beforeScroll,
-                            beforeScroll: beforeScroll,
-                            afterScroll: afterScroll,
-                            scrollHeight: div.scrollHeight,
-                            method: 'find by overflow'
-                        };
-                    }
-                }
-                
-                return { 
-                    success: false, 
-                    error: 'No scrollable div found',
-                    totalDivs: divs.length,
-                    maxLinksFound: maxLinks
-                };
-            }''')
-            
-            # Debug logging
-            if scroll_result.get('success'):
-                print(f"[PLAYWRIGHT] Scroll: {scroll_result.get('beforeScroll')}px → {scroll_result.get('afterScroll')}px (height: {scroll_result.get('scrollHeight')}px)")
-                sys.stdout.flush()
-            else:
-                print(f"[PLAYWRIGHT] WARNING: Scroll failed - {scroll_result.get('error')} (checked {scroll_result.get('totalDivs', 0)} divs)")
-                sys.stdout.flush()
-            
-            time.sleep(random.uniform(0.5, 1))
-        
-        _log(f"[PLAYWRIGHT] Finished collecting following: {len(following)} total")
-        
-        # Close dialog
-        page.keyboard.press('Escape')
-        time.sleep(1)
-        
-        # Close browser
-        page.close()
-        context.close()
-        browser.close()
-        playwright.stop()
-        
-        return {
-            'success': True,
-            'following': following[:limit],
-            'count': len(following[:limit])
-        }
+            response = client.get(PROFILE_INFO_URL, params={'username': username})
+            # Back off and retry the same lookup while Instagram is only throttling
+            if backpressure and response.status_code in _THROTTLE_STATUSES and backpressure.on_throttle(_retry_after(response.headers, None)):
+                continue
+            break
+        if response.status_code != 200:
+            _log(f"[HTTP] Profile lookup for {username} got status {response.status_code}")
+            return None
+        if backpressure:
+            backpressure.on_success(response.headers)
+        user_id = ((orjson.loads(response.content).get('data') or {}).get('user') or {}).get('id')
+        if not user_id:
+            _log(f"[HTTP] No user ID in profile info for {username}")
+            return None
+        _remember_user_id(username, user_id)
+        return user_id
+    except Exception as e:
+        _log(f"[HTTP] Exception looking up {username}: {str(e)}")
+        return None
+
+
+def instagram_resolve_user_ids(usernames: list, session_cookies: list) -> Dict[str, str]:
+    """Resolve user IDs for the given usernames over HTTP; usernames that fail are left out."""
+    user_ids = {}
+    pacer = _Backpressure()
+    for i, username in enumerate(usernames):
+        if i and not _cached_user_id(username):
+            # Small delay between requests to be respectful (cached IDs make no request)
+            pacer.wait()
+        user_id = _resolve_user_id_http(username, session_cookies, pacer)
+        if pacer.tripped:
+            # Still throttled after the cooldown - the rest go to the browser batch unresolved
+            _log(f"[HTTP] Profile lookups throttled, leaving {len(usernames) - i} usernames unresolved")
+            break
+        if user_id:
+            user_ids[username] = user_id
+    _log(f"[HTTP] Resolved {len(user_ids)}/{len(usernames)} user IDs")
+    return user_ids
+
+
+def iter_friendships_api(username: str, session_cookies: list, kind: str, limit: int,
+                         backpressure: Optional[_Backpressure] = None, progress: Optional[dict] = None):
+    """Yield a profile's followers or following over plain HTTP, one page of new users at a time.
+    
+    Resolves the user ID through web_profile_info and pages through the same
+    friendships endpoint the browser path uses, without starting Chromium.
+    Each batch holds only users not seen in earlier batches, and the total
+    stops at ``limit``. Raises if a page can't be fetched, after the batches
+    already yielded; ``progress['next_max_id']`` then holds the cursor of the
+    page that failed, so another client can pick up from there.
+    """
+    headers = _api_headers(session_cookies)
+    if not headers:
+        raise Exception("No csrftoken cookie in session")
+    
+    backpressure = backpressure or _Backpressure()
+    user_id = _resolve_user_id_http(username, session_cookies, backpressure)
+    if not user_id:
+        raise Exception(f"Could not resolve user ID for {username}")
+    
+    client = _http_client(session_cookies)
+    seen_ids = set()
+    next_max_id = None
+    request_count = 0
+    if progress is None:
+        progress = {}
+    
+    while len(seen_ids) < limit:
+        request_count += 1
+        params = {'count': min(200, limit - len(seen_ids))}
+        if next_max_id:
+            params['max_id'] = next_max_id
+        
+        response = client.get(f'https://www.instagram.com/api/v1/friendships/{user_id}/{kind}/', params=params, headers=headers)
+        if response.status_code in _THROTTLE_STATUSES and backpressure.on_throttle(_retry_after(response.headers, None)):
+            continue
+        if response.status_code != 200:
+            raise Exception(f"{kind} request {request_count} got status {response.status_code}")
+        data = orjson.loads(response.content)
+        _log_api_response(f'{kind}_http', {
+            'request': request_count,
+            'url': str(response.url),
+            'status': response.status_code,
+            'data': data
+        })
         
+        batch = []
+        for user in data.get('users', []):
+            if not user.get('username'):
+                continue
+            key = user.get('pk') or user['username']
+            if key not in seen_ids and len(seen_ids) < limit:
+                seen_ids.add(key)
+                batch.append(_api_user(user))
+        _log(f"[HTTP] Total {kind} collected so far: {len(seen_ids)}")
+        backpressure.on_success(response.headers)
+        next_max_id = data.get('next_max_id')
+        progress['next_max_id'] = next_max_id
+        if batch:
+            yield batch
+        
+        if not data.get('has_more') or not next_max_id:
+            break
+        
+        # Adaptive delay between requests to be respectful
+        backpressure.wait()
+    
+    _log(f"[HTTP] Fetched {len(seen_ids)} {kind} in {request_count} requests")
+
+
+def _fetch_friendships_http(username: str, session_cookies: list, kind: str, limit: int,
+                            backpressure: _Backpressure, progress: dict) -> Optional[list]:
+    """Collect iter_friendships_api into one list, or None if anything goes wrong.
+    
+    Callers fall back to the browser on None instead of returning a partial list;
+    the users collected so far and the next cursor are left in ``progress``.
+    """
+    users = progress.setdefault('users', [])
+    try:
+        for batch in iter_friendships_api(username, session_cookies, kind, limit, backpressure, progress):
+            users.extend(batch)
+        return users
     except Exception as e:
-        _log(f"[PLAYWRIGHT] Exception in get_following: {str(e)}")
-        if browser:
-            try:
-                screenshot_path = f"c:/GitHub/johnapaez/instagram-tool/backend/logs/debug/following_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                page.screenshot(path=screenshot_path)
-                _log(f"[PLAYWRIGHT] Error screenshot saved to: {screenshot_path}")
-            except:
-                pass
-            browser.close()
-        if playwright:
-            playwright.stop()
-        return {'success': False, 'error': str(e)}
+        _log(f"[HTTP] Exception fetching {kind}: {str(e)}")
+        return None
 
 
-# ============================================================================
-# API-BASED SCRAPERS (Faster, more reliable alternative to HTML scraping)
-# ============================================================================
+def _extract_user_id(page, username: str) -> Optional[str]:
+    """Return the profile's user ID from the lookup cache, or from web_profile_info via the page's session."""
+    user_id = _cached_user_id(username)
+    if user_id:
+        _log(f"[API] Using cached user ID for {username}: {user_id}")
+        return user_id
+    
+    # One small JSON request instead of loading the profile page and scanning its scripts
+    _log(f"[API] Looking up user ID for {username}...")
+    try:
+        response = page.request.get(PROFILE_INFO_URL, params={'username': username}, headers={'x-ig-app-id': IG_APP_ID})
+        if response.status != 200:
+            _log(f"[API] Profile lookup got status {response.status}")
+            return None
+        user_id = ((orjson.loads(response.body()).get('data') or {}).get('user') or {}).get('id')
+        _log(f"[API] Extracted user ID: {user_id}")
+    except Exception as e:
+        _log(f"[API] Could not extract user ID: {e}")
+        return None
+    
+    if user_id:
+        _remember_user_id(username, user_id)
+    return user_id
 
-def instagram_get_followers_api(username: str, session_cookies: list, limit: int = 999999, headless: bool = False) -> Dict:
-    """Fetch followers using Instagram's internal API (much faster than HTML scraping).
+
+def _fetch_friendship_list(username: str, session_cookies: list, kind: str, limit: int, headless: bool) -> Dict:
+    """Fetch followers or following (``kind``) using Instagram's internal API.
     
     This accesses the same API that Instagram's web app uses, providing structured JSON data.
-    Falls back to HTML scraping if API approach fails.
+    Tries plain HTTP requests first, then the API from inside a browser page,
+    which continues from the last page the HTTP requests got. Falls back to
+    HTML scraping if API approach fails. Both API tiers share one backpressure
+    state, so once Instagram keeps throttling the browser tier is skipped.
     """
-    playwright = None
-    browser = None
+    backpressure = _Backpressure()
+    progress = {'users': [], 'next_max_id': None}
+    users = _fetch_friendships_http(username, session_cookies, kind, limit, backpressure, progress)
+    if users is not None:
+        return {'success': True, kind: users, 'count': len(users), 'method': 'http'}
+    
+    if backpressure.tripped:
+        # Same endpoint, same account - asking again from the browser would only add more throttled requests
+        _log(f"[API] Instagram is still throttling {kind} requests, falling back to HTML scraper...")
+        return _scrape_follow_list(username, session_cookies, kind, limit, headless)
+    
+    context = None
     
     try:
-        _log(f"[API] Starting API-based followers fetch for {username}...")
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
-        
-        # Load session cookies
-        _log(f"[API] Loading {len(session_cookies)} session cookies...")
-        context.add_cookies(session_cookies)
+        _log(f"[API] Starting API-based {kind} fetch for {username}...")
+        browser = BrowserPool.get_browser(headless)
+        # Load the session (saved storage state, or the raw cookies)
+        context = _session_context(browser, session_cookies, block_assets=True)
         
         page = context.new_page()
         
-        # First, navigate to profile to get user ID
-        _log(f"[API] Navigating to profile to extract user ID...")
-        page.goto(f'https://www.instagram.com/{username}/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(1)
-        
-        # Extract user ID from page source
-        user_id = None
-        try:
-            # Instagram embeds user data in script tags
-            user_id = page.evaluate('''() => {
-                const scripts = document.querySelectorAll('script');
-                for (let script of scripts) {
-                    const text = script.textContent;
-                    if (text.includes('"user_id"') || text.includes('"id"')) {
-                        // Try to extract user ID from various patterns
-                        const match = text.match(/"user_id":"(\\d+)"/);
-                        if (match) return match[1];
-                        const match2 = text.match(/"id":"(\\d+)"/);
-                        if (match2) return match2[1];
-                    }
-                }
-                return null;
-            }''')
-            _log(f"[API] Extracted user ID: {user_id}")
-        except Exception as e:
-            _log(f"[API] Could not extract user ID: {e}")
+        # Resolve the profile's user ID (cached, otherwise looked up through web_profile_info)
+        user_id = _extract_user_id(page, username)
         
         if not user_id:
             _log(f"[API] Failed to get user ID, falling back to HTML scraper...")
-            browser.close()
-            playwright.stop()
+            context.close()
             # Fall back to HTML scraping
-            return instagram_get_followers(username, session_cookies, limit, headless)
+            return _scrape_follow_list(username, session_cookies, kind, limit, headless)
         
-        followers = []
-        seen_usernames = set()
-        next_max_id = None
+        # pk -> projected user, starting from the pages the HTTP requests already got
+        seen_ids = {user['user_id'] or user['username']: user for user in progress['users']}
+        next_max_id = progress['next_max_id'] if seen_ids else None
         request_count = 0
         
-        _log(f"[API] Starting API pagination for user ID {user_id}...")
+        _log(f"[API] Starting API pagination for user ID {user_id} ({len(seen_ids)} {kind} already collected)...")
         
-        # Extract CSRF token from cookies for API requests
-        csrf_token = None
-        for cookie in session_cookies:
-            if cookie.get('name') == 'csrftoken':
-                csrf_token = cookie.get('value')
-                break
+        # API headers (with the CSRF token from cookies) stay the same for every page
+        api_headers = _api_headers(session_cookies)
         
-        if not csrf_token:
+        if not api_headers:
             _log(f"[API] No CSRF token found, falling back to HTML scraper...")
-            browser.close()
-            playwright.stop()
-            return instagram_get_followers(username, session_cookies, limit, headless)
+            context.close()
+            return _scrape_follow_list(username, session_cookies, kind, limit, headless)
         
-        _log(f"[API] Found CSRF token: {csrf_token[:20]}...")
+        _log(f"[API] Found CSRF token: {api_headers['x-csrftoken'][:20]}...")
         
-        while len(followers) < limit:
+        while len(seen_ids) < limit:
             request_count += 1
             
             # Build API URL
-            api_url = f"https://www.instagram.com/api/v1/friendships/{user_id}/followers/?count=200"
+            # Don't ask for more than the limit still needs
+            page_size = min(200, limit - len(seen_ids))
+            api_url = f"https://www.instagram.com/api/v1/friendships/{user_id}/{kind}/?count={page_size}"
             if next_max_id:
                 api_url += f"&max_id={next_max_id}"
             
-            _log(f"[API] Request {request_count}: Fetching up to 200 followers...")
+            _log(f"[API] Request {request_count}: Fetching up to {page_size} {kind}...")
             
             try:
                 # Make API request with required Instagram headers
-                response = page.request.get(api_url, headers={
-                    'x-ig-app-id': '936619743392459',  # Instagram web app ID
-                    'x-asbd-id': '129477',
-                    'x-csrftoken': csrf_token,
-                    'x-requested-with': 'XMLHttpRequest'
-                })
+                response = page.request.get(api_url, headers=api_headers)
+                
+                # Back off and retry the same page while Instagram is only throttling
+                if response.status in _THROTTLE_STATUSES and backpressure.on_throttle(_retry_after(response.headers, None)):
+                    continue
                 
                 if response.status != 200:
                     _log(f"[API] Error: Got status {response.status}")
@@ -913,17 +1131,16 @@ def instagram_get_followers_api(username: str, session_cookies: list, limit: int
                     except:
                         pass
                     _log(f"[API] Falling back to HTML scraper due to API error...")
-                    # Close browser and fall back
+                    # Close context and fall back
                     page.close()
                     context.close()
-                    browser.close()
-                    playwright.stop()
-                    return instagram_get_followers(username, session_cookies, limit, headless)
+                    return _scrape_follow_list(username, session_cookies, kind, limit, headless)
                 
-                data = response.json()
+                data = orjson.loads(response.body())
                 
                 # Log the response for debugging
-                _log_api_response(f'followers_api_batch_{request_count}', {
+                _log_api_response(f'{kind}_api', {
+                    'request': request_count,
                     'url': api_url,
                     'status': response.status,
                     'data': data
@@ -934,352 +1151,234 @@ def instagram_get_followers_api(username: str, session_cookies: list, limit: int
                 _log(f"[API] Received {len(users)} users in this batch")
                 
                 for user in users:
-                    username_str = user.get('username')
-                    if username_str and username_str not in seen_usernames:
-                        seen_usernames.add(username_str)
-                        
-                        followers.append({
-                            'username': username_str,
-                            'full_name': user.get('full_name', ''),
-                            'is_verified': user.get('is_verified', False),
-                            'profile_pic_url': user.get('profile_pic_url', ''),
-                            'user_id': user.get('pk', ''),
-                            'is_private': user.get('is_private', False),
-                            'has_anonymous_profile_picture': user.get('has_anonymous_profile_picture', False),
-                            'latest_reel_media': user.get('latest_reel_media', 0)
-                        })
+                    if not user.get('username'):
+                        continue
+                    # Keyed by the numeric pk, Instagram's real identity for the account
+                    pk = user.get('pk') or user['username']
+                    if pk not in seen_ids:
+                        seen_ids[pk] = _api_user(user)
+                
+                backpressure.on_success(response.headers)
                 
                 # Check if there are more results
                 has_more = data.get('has_more', False)
                 next_max_id = data.get('next_max_id')
                 
-                _log(f"[API] Total collected so far: {len(followers)} | Has more: {has_more}")
+                _log(f"[API] Total collected so far: {len(seen_ids)} | Has more: {has_more}")
                 
                 if not has_more or not next_max_id:
-                    _log(f"[API] Reached end of followers list")
+                    _log(f"[API] Reached end of {kind} list")
                     break
                 
-                # Small delay between requests to be respectful
-                time.sleep(random.uniform(0.5, 1))
+                # Adaptive delay between requests to be respectful
+                backpressure.wait()
                 
             except Exception as e:
                 _log(f"[API] Error during pagination: {e}")
                 break
         
-        # Close browser
+        # Close context (the pooled browser stays up)
         page.close()
         context.close()
-        browser.close()
-        playwright.stop()
         
-        _log(f"[API] Successfully fetched {len(followers)} followers via API in {request_count} requests")
+        users = list(seen_ids.values())[:limit]
+        _log(f"[API] Successfully fetched {len(users)} {kind} via API in {request_count} requests")
         
         return {
             'success': True,
-            'followers': followers[:limit],
-            'count': len(followers[:limit]),
+            kind: users,
+            'count': len(users),
             'method': 'api'
         }
         
     except Exception as e:
-        _log(f"[API] Exception in get_followers_api: {str(e)}")
-        if browser:
-            browser.close()
-        if playwright:
-            playwright.stop()
+        _log(f"[API] Exception in get_{kind}_api: {str(e)}")
+        if context:
+            context.close()
         
         # Fall back to HTML scraping
         _log(f"[API] Falling back to HTML scraper due to error...")
-        return instagram_get_followers(username, session_cookies, limit, headless)
+        return _scrape_follow_list(username, session_cookies, kind, limit, headless)
+
+
+def instagram_get_followers_api(username: str, session_cookies: list, limit: int = 999999, headless: bool = False) -> Dict:
+    """Fetch followers using Instagram's internal API (much faster than HTML scraping)."""
+    return _fetch_friendship_list(username, session_cookies, 'followers', limit, headless)
 
 
 def instagram_get_following_api(username: str, session_cookies: list, limit: int = 999999, headless: bool = False) -> Dict:
-    """Fetch following using Instagram's internal API (much faster than HTML scraping).
+    """Fetch following using Instagram's internal API (much faster than HTML scraping)."""
+    return _fetch_friendship_list(username, session_cookies, 'following', limit, headless)
+
+
+# ============================================================================
+# UNFOLLOW FUNCTIONS
+# ============================================================================
+
+# Unfollow selectors: only visible candidates, and the confirmation is looked up inside
+# the menu dialog rather than across the whole profile page
+_FOLLOWING_BUTTON = 'button:has-text("Following"):visible'
+_UNFOLLOW_CONFIRM = ', '.join(
+    f'div[role="dialog"] {target}:has-text("Unfollow"):visible'
+    for target in ('[role="menuitem"]', 'button', 'span')
+)
+_FOLLOW_BUTTON = 'button:has-text("Follow"):not(:has-text("Following")):visible'
+_REQUESTED_BUTTON = 'button:has-text("Requested"):visible'
+# Shown instead of the profile header when the account was deleted, renamed or blocked us.
+# Matched with get_by_text: a text= selector can't be part of a CSS selector list.
+_PROFILE_UNAVAILABLE_TEXT = re.compile(r"Sorry, this page isn['’]t available")
+_UNFOLLOW_SELECTORS = (_FOLLOWING_BUTTON, _UNFOLLOW_CONFIRM, _FOLLOW_BUTTON, _REQUESTED_BUTTON)
+_unfollow_selectors_checked = False
+
+# Wall-clock budget for one user's whole unfollow sequence, so a slow profile
+# can't hold a worker for the sum of every individual Playwright timeout
+UNFOLLOW_DEADLINE_S = 20.0
+
+
+_UNFOLLOW_API_MARKERS = ('/api/', 'friendships', '/graphql/query', '/sync/')
+
+
+def _log_unfollow_api(response):
+    """Network interception for unfollow API - log POSTs to Instagram API endpoints.
     
-    This accesses the same API that Instagram's web app uses, providing structured JSON data.
-    Falls back to HTML scraping if API approach fails.
+    Runs for every response on the page, so it filters on the URL before
+    touching anything else; headers and bodies are only read when
+    LOG_API_RESPONSES is enabled.
     """
-    playwright = None
-    browser = None
-    
     try:
-        _log(f"[API] Starting API-based following fetch for {username}...")
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
-        
-        # Load session cookies
-        _log(f"[API] Loading {len(session_cookies)} session cookies...")
-        context.add_cookies(session_cookies)
-        
-        page = context.new_page()
-        
-        # First, navigate to profile to get user ID
-        _log(f"[API] Navigating to profile to extract user ID...")
-        page.goto(f'https://www.instagram.com/{username}/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(1)
-        
-        # Extract user ID from page source
-        user_id = None
+        url = response.url
+        if 'instagram.com' not in url or not any(marker in url for marker in _UNFOLLOW_API_MARKERS):
+            return
+        request = response.request
+        if request.method != 'POST':
+            return
+        
+        _log(f"[UNFOLLOW-API] POST to: {url} (status {response.status})")
+        if not settings.log_api_responses:
+            return
+        
+        _log(f"[UNFOLLOW-API] Headers: {request.headers}")
+        if request.post_data:
+            _log(f"[UNFOLLOW-API] Post Data: {request.post_data}")
         try:
-            user_id = page.evaluate('''() => {
-                const scripts = document.querySelectorAll('script');
-                for (let script of scripts) {
-                    const text = script.textContent;
-                    if (text.includes('"user_id"') || text.includes('"id"')) {
-                        const match = text.match(/"user_id":"(\\d+)"/);
-                        if (match) return match[1];
-                        const match2 = text.match(/"id":"(\\d+)"/);
-                        if (match2) return match2[1];
-                    }
-                }
-                return null;
-            }''')
-            _log(f"[API] Extracted user ID: {user_id}")
-        except Exception as e:
-            _log(f"[API] Could not extract user ID: {e}")
-        
-        if not user_id:
-            _log(f"[API] Failed to get user ID, falling back to HTML scraper...")
-            browser.close()
-            playwright.stop()
-            return instagram_get_following(username, session_cookies, limit, headless)
-        
-        following = []
-        seen_usernames = set()
-        next_max_id = None
-        request_count = 0
-        
-        _log(f"[API] Starting API pagination for user ID {user_id}...")
-        
-        # Extract CSRF token from cookies for API requests
-        csrf_token = None
-        for cookie in session_cookies:
-            if cookie.get('name') == 'csrftoken':
-                csrf_token = cookie.get('value')
-                break
-        
-        if not csrf_token:
-            _log(f"[API] No CSRF token found, falling back to HTML scraper...")
-            browser.close()
-            playwright.stop()
-            return instagram_get_following(username, session_cookies, limit, headless)
-        
-        _log(f"[API] Found CSRF token: {csrf_token[:20]}...")
-        
-        while len(following) < limit:
-            request_count += 1
-            
-            # Build API URL
-            api_url = f"https://www.instagram.com/api/v1/friendships/{user_id}/following/?count=200"
-            if next_max_id:
-                api_url += f"&max_id={next_max_id}"
-            
-            _log(f"[API] Request {request_count}: Fetching up to 200 following...")
-            
-            try:
-                # Make API request with required Instagram headers
-                response = page.request.get(api_url, headers={
-                    'x-ig-app-id': '936619743392459',  # Instagram web app ID
-                    'x-asbd-id': '129477',
-                    'x-csrftoken': csrf_token,
-                    'x-requested-with': 'XMLHttpRequest'
-                })
-                
-                if response.status != 200:
-                    _log(f"[API] Error: Got status {response.status}")
-                    try:
-                        error_body = response.text()
-                        _log(f"[API] Response body: {error_body[:500]}")
-                    except:
-                        pass
-                    _log(f"[API] Falling back to HTML scraper due to API error...")
-                    # Close browser and fall back
-                    page.close()
-                    context.close()
-                    browser.close()
-                    playwright.stop()
-                    return instagram_get_following(username, session_cookies, limit, headless)
-                
-                data = response.json()
-                
-                _log_api_response(f'following_api_batch_{request_count}', {
-                    'url': api_url,
-                    'status': response.status,
-                    'data': data
-                })
-                
-                users = data.get('users', [])
-                _log(f"[API] Received {len(users)} users in this batch")
-                
-                for user in users:
-                    username_str = user.get('username')
-                    if username_str and username_str not in seen_usernames:
-                        seen_usernames.add(username_str)
-                        
-                        following.append({
-                            'username': username_str,
-                            'full_name': user.get('full_name', ''),
-                            'is_verified': user.get('is_verified', False),
-                            'profile_pic_url': user.get('profile_pic_url', ''),
-                            'user_id': user.get('pk', ''),
-                            'is_private': user.get('is_private', False),
-                            'has_anonymous_profile_picture': user.get('has_anonymous_profile_picture', False),
-                            'latest_reel_media': user.get('latest_reel_media', 0)
-                        })
-                
-                has_more = data.get('has_more', False)
-                next_max_id = data.get('next_max_id')
-                
-                _log(f"[API] Total collected so far: {len(following)} | Has more: {has_more}")
-                
-                if not has_more or not next_max_id:
-                    _log(f"[API] Reached end of following list")
-                    break
-                
-                time.sleep(random.uniform(0.5, 1))
-                
-            except Exception as e:
-                _log(f"[API] Error during pagination: {e}")
-                break
-        
-        page.close()
-        context.close()
-        browser.close()
-        playwright.stop()
-        
-        _log(f"[API] Successfully fetched {len(following)} following via API in {request_count} requests")
-        
-        return {
-            'success': True,
-            'following': following[:limit],
-            'count': len(following[:limit]),
-            'method': 'api'
-        }
-        
+            body = response.body()
+            if len(body) <= 64_000:
+                _log(f"[UNFOLLOW-API] Response: {orjson.dumps(orjson.loads(body), option=orjson.OPT_INDENT_2).decode()}")
+        except:
+            pass
     except Exception as e:
-        _log(f"[API] Exception in get_following_api: {str(e)}")
-        if browser:
-            browser.close()
-        if playwright:
-            playwright.stop()
-        
-        _log(f"[API] Falling back to HTML scraper due to error...")
-        return instagram_get_following(username, session_cookies, limit, headless)
+        pass  # Silently ignore errors in logging
 
 
-# ============================================================================
-# UNFOLLOW FUNCTIONS
-# ============================================================================
-
-def instagram_unfollow_user(username: str, session_cookies: list, headless: bool = False) -> Dict:
-    """Unfollow a single user using sync Playwright."""
-    playwright = None
-    browser = None
+def _unfollow_on_page(page, username: str) -> Dict:
+    """Unfollow one user from an already logged-in page; navigates to their profile first.
+    
+    Every Playwright call is capped by what is left of UNFOLLOW_DEADLINE_S.
+    """
+    deadline = time.monotonic() + UNFOLLOW_DEADLINE_S
+    
+    def budget(timeout_ms: int) -> int:
+        """Timeout for the next call: its own cap, or whatever is left before the deadline."""
+        return max(1, min(timeout_ms, int((deadline - time.monotonic()) * 1000)))
+    
+    def deadline_exceeded() -> Optional[Dict]:
+        if time.monotonic() < deadline:
+            return None
+        _log(f"[PLAYWRIGHT] Deadline of {UNFOLLOW_DEADLINE_S:.0f}s exceeded for {username}")
+        return {'success': False, 'username': username, 'error': 'deadline exceeded'}
     
     try:
-        _log(f"[PLAYWRIGHT] Starting unfollow for: {username}")
-        playwright = sync_playwright().start()
-        browser, context = _create_browser_context(playwright, headless)
-        
-        # Load session cookies
-        context.add_cookies(session_cookies)
-        
-        page = context.new_page()
-        
-        # Network interception for unfollow API - log ALL POST requests to see what Instagram uses
-        def log_unfollow_api(response):
-            try:
-                # Log all POST requests to Instagram
-                if response.request.method == 'POST' and 'instagram.com' in response.url:
-                    _log(f"[NETWORK] POST to: {response.url}")
-                    _log(f"[NETWORK] Status: {response.status}")
-                    
-                    # If it looks like an API endpoint, log full details
-                    if '/api/' in response.url or 'friendships' in response.url or '/graphql/query' in response.url or '/sync/' in response.url:
-                        _log(f"[UNFOLLOW-API] ⭐ Full API Details:")
-                        _log(f"[UNFOLLOW-API] URL: {response.url}")
-                        _log(f"[UNFOLLOW-API] Status: {response.status}")
-                        _log(f"[UNFOLLOW-API] Method: {response.request.method}")
-                        _log(f"[UNFOLLOW-API] Headers: {dict(response.request.headers)}")
-                        if response.request.post_data:
-                            _log(f"[UNFOLLOW-API] Post Data: {response.request.post_data}")
-                        try:
-                            body = response.json()
-                            _log(f"[UNFOLLOW-API] Response: {json.dumps(body, indent=2)}")
-                        except:
-                            pass
-            except Exception as e:
-                pass  # Silently ignore errors in logging
-        
-        page.on('response', log_unfollow_api)
-        
         # Navigate to user's profile
         _log(f"[PLAYWRIGHT] Navigating to profile: {username}")
-        page.goto(f'https://www.instagram.com/{username}/', wait_until='domcontentloaded', timeout=60000)
-        time.sleep(random.uniform(2, 3))
-        
-        # Find the "Following" button
-        _log(f"[PLAYWRIGHT] Looking for Following button...")
-        following_button = page.locator('button:has-text("Following")')
+        # Only wait for the response to commit; the Following button below is the real readiness signal
+        response = page.goto(f'https://www.instagram.com/{username}/', wait_until='commit', timeout=budget(15000))
+        
+        # Fail fast on missing profiles instead of waiting out the button timeout
+        if response is None or response.status in (404, 410) or '/accounts/login' in page.url:
+            status = response.status if response else 'no response'
+            _log(f"[PLAYWRIGHT] Profile not reachable ({status}): {username}")
+            return {'success': False, 'username': username, 'error': f'profile not reachable ({status})'}
+        
+        # Read the profile's follow state from whichever header marker renders first,
+        # so profiles we no longer follow don't wait out the Following button timeout
+        _log(f"[PLAYWRIGHT] Reading follow state...")
+        # Each state is its own locator, combined with or_() rather than one selector string
+        marker = (
+            page.locator(_FOLLOWING_BUTTON)
+            .or_(page.locator(_REQUESTED_BUTTON))
+            .or_(page.locator(_FOLLOW_BUTTON))
+            .or_(page.get_by_text(_PROFILE_UNAVAILABLE_TEXT))
+        ).first
         
-        if not following_button.is_visible(timeout=5000):
-            _log(f"[PLAYWRIGHT] Following button not found - user may not be followed")
-            page.close()
-            context.close()
-            browser.close()
-            playwright.stop()
+        try:
+            marker.wait_for(state='visible', timeout=budget(15000))
+            follow_state = (marker.text_content(timeout=budget(DEFAULT_TIMEOUT_MS)) or '').strip()
+        except PlaywrightTimeoutError:
+            expired = deadline_exceeded()
+            if expired:
+                return expired
+            _log(f"[PLAYWRIGHT] Follow button not found on profile")
             return {'success': False, 'username': username, 'error': 'User not followed or button not found'}
         
+        # Branch on the marker's text: the unavailable notice, Following/Requested, or Follow (Back)
+        if _PROFILE_UNAVAILABLE_TEXT.search(follow_state):
+            _log(f"[PLAYWRIGHT] Profile not available: {username}")
+            return {'success': False, 'username': username, 'error': 'profile not reachable (page not available)'}
+        
+        if 'Following' not in follow_state and 'Requested' not in follow_state:
+            # Stale list entry: the profile already shows Follow, so there is nothing to undo
+            _log(f"[PLAYWRIGHT] Already not following {username} ('{follow_state}'), skipping")
+            return {
+                'success': True,
+                'skipped': True,
+                'username': username,
+                'timestamp': datetime.now().isoformat()
+            }
+        
+        # A pending follow request is withdrawn through the same menu as a follow
+        following_button = page.locator(f'{_FOLLOWING_BUTTON}, {_REQUESTED_BUTTON}').first
+        
         # Click the Following button
         _log(f"[PLAYWRIGHT] Clicking Following button...")
-        following_button.first.click()
-        time.sleep(random.uniform(1, 2))
+        following_button.click(timeout=budget(DEFAULT_TIMEOUT_MS))
         
-        # Click Unfollow in the confirmation dialog
+        # Click Unfollow in the confirmation dialog - waiting for it replaces a fixed pause
         _log(f"[PLAYWRIGHT] Looking for Unfollow confirmation...")
         
-        # Take screenshot for debugging
+        # Try flexible selector to find Unfollow in menu/dialog (not just buttons)
+        unfollow_element = page.locator(_UNFOLLOW_CONFIRM).first
         try:
-            screenshot_path = f"c:/GitHub/johnapaez/instagram-tool/backend/logs/debug/unfollow_dialog_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            page.screenshot(path=screenshot_path)
-            _log(f"[PLAYWRIGHT] Dialog screenshot saved to: {screenshot_path}")
-        except Exception as screenshot_error:
-            _log(f"[PLAYWRIGHT] Failed to save screenshot: {screenshot_error}")
-        
-        # Log all visible buttons for debugging
-        all_buttons = page.locator('button').all()
-        _log(f"[PLAYWRIGHT] Found {len(all_buttons)} buttons on page")
-        for i, btn in enumerate(all_buttons[:10]):  # Log first 10 buttons
-            try:
-                text = btn.text_content() or ""
-                if text.strip():
-                    _log(f"[PLAYWRIGHT] Button {i}: '{text.strip()}'")
-            except:
-                pass
+            unfollow_element.wait_for(state='visible', timeout=budget(5000))
+            unfollow_found = True
+        except PlaywrightTimeoutError:
+            expired = deadline_exceeded()
+            if expired:
+                return expired
+            unfollow_found = False
         
-        # Try flexible selector to find Unfollow in menu/dialog (not just buttons)
-        unfollow_element = page.locator('[role="menuitem"]:has-text("Unfollow"), button:has-text("Unfollow"), span:has-text("Unfollow")').first
+        # Take screenshot for debugging
+        _debug_screenshot(page, f'unfollow_dialog_{username}')
         
-        if not unfollow_element.is_visible(timeout=5000):
+        if not unfollow_found:
             _log(f"[PLAYWRIGHT] Unfollow option not found in menu")
-            page.close()
-            context.close()
-            browser.close()
-            playwright.stop()
+            # Log the page's buttons for debugging - only on this failure path, in one evaluate_all call
+            button_texts = page.locator('button').evaluate_all("buttons => buttons.slice(0, 10).map(b => (b.textContent || '').trim())")
+            for i, text in enumerate(button_texts):
+                if text:
+                    _log(f"[PLAYWRIGHT] Button {i}: '{text}'")
             return {'success': False, 'username': username, 'error': 'Unfollow option not found'}
         
         # Click the Unfollow option
         _log(f"[PLAYWRIGHT] Clicking Unfollow...")
-        unfollow_element.click()
-        time.sleep(random.uniform(2, 3))
+        unfollow_element.click(timeout=budget(DEFAULT_TIMEOUT_MS))
         
-        _log(f"[PLAYWRIGHT] Successfully unfollowed: {username}")
+        # Wait for the profile to flip back to "Follow" instead of pausing a fixed 2-3s
+        try:
+            page.locator(_FOLLOW_BUTTON).first.wait_for(state='visible', timeout=budget(5000))
+        except PlaywrightTimeoutError:
+            _log(f"[PLAYWRIGHT] Follow button did not reappear yet for {username}")
         
-        # Close browser
-        page.close()
-        context.close()
-        browser.close()
-        playwright.stop()
+        _log(f"[PLAYWRIGHT] Successfully unfollowed: {username}")
         
         return {
             'success': True,
@@ -1287,66 +1386,250 @@ def instagram_unfollow_user(username: str, session_cookies: list, headless: bool
             'timestamp': datetime.now().isoformat()
         }
         
+    except Exception as e:
+        expired = deadline_exceeded()
+        if expired:
+            return expired
+        _log(f"[PLAYWRIGHT] Exception in unfollow_user: {str(e)}")
+        _debug_screenshot(page, f'unfollow_error_{username}')
+        return {'success': False, 'username': username, 'error': str(e)}
+
+
+def _check_unfollow_selectors(page):
+    """Run the unfollow selectors through Playwright's selector parser once per process.
+    
+    Counting matches on the fresh page is enough to make Playwright parse each
+    selector, so a malformed one fails here with its name instead of failing
+    every unfollow later with a generic error.
+    """
+    global _unfollow_selectors_checked
+    if _unfollow_selectors_checked:
+        return
+    for selector in _UNFOLLOW_SELECTORS:
+        try:
+            page.locator(selector).count()
+        except Exception as e:
+            raise Exception(f"Invalid unfollow selector {selector!r}: {e}")
+    _unfollow_selectors_checked = True
+
+
+def _open_unfollow_page(session_cookies: list, headless: bool, state: Optional[Dict] = None):
+    """Open a logged-in context and page on the pooled browser for unfollowing."""
+    browser = BrowserPool.get_browser(headless)
+    # Load the session (saved storage state, or the raw cookies)
+    context = _session_context(browser, session_cookies, block_assets=True,
+                               blocked_types=UNFOLLOW_BLOCKED_TYPES, state=state)
+    try:
+        page = context.new_page()
+        _check_unfollow_selectors(page)
+    except Exception:
+        context.close()
+        raise
+    page.on('response', _log_unfollow_api)
+    return context, page
+
+
+def _warm_up(page):
+    """Open the Instagram connection (DNS, TLS, HTTP/2) before the first profile navigation."""
+    try:
+        page.goto('https://www.instagram.com/', wait_until='commit', timeout=15000)
+    except Exception as e:
+        _log(f"[PLAYWRIGHT] Warm-up navigation failed: {str(e)}")
+
+
+def instagram_unfollow_user(username: str, session_cookies: list, headless: bool = False) -> Dict:
+    """Unfollow a single user using sync Playwright."""
+    context = None
+    
+    try:
+        _log(f"[PLAYWRIGHT] Starting unfollow for: {username}")
+        context, page = _open_unfollow_page(session_cookies, headless)
+        return _unfollow_on_page(page, username)
     except Exception as e:
         _log(f"[PLAYWRIGHT] Exception in unfollow_user: {str(e)}")
-        if browser:
+        return {'success': False, 'username': username, 'error': str(e)}
+    finally:
+        # Close context (the pooled browser stays up)
+        if context:
             try:
-                screenshot_path = f"c:/GitHub/johnapaez/instagram-tool/backend/logs/debug/unfollow_error_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                page.screenshot(path=screenshot_path)
-                _log(f"[PLAYWRIGHT] Error screenshot saved to: {screenshot_path}")
+                context.close()
             except:
                 pass
-            browser.close()
-        if playwright:
-            playwright.stop()
-        return {'success': False, 'username': username, 'error': str(e)}
 
 
-def instagram_unfollow_batch(usernames: list, session_cookies: list, min_delay: int = 30, max_delay: int = 60, headless: bool = False) -> Dict:
-    """Unfollow multiple users with delays between each action."""
+# Unfollow workers run on these long-lived threads so each keeps its pooled
+# browser between batches instead of starting Playwright again for every batch
+_UNFOLLOW_HELPERS = 4
+_unfollow_helpers = ThreadPoolExecutor(max_workers=_UNFOLLOW_HELPERS, thread_name_prefix='unfollow')
+
+
+def release_unfollow_browsers(timeout: float = 10.0):
+    """Close the pooled browsers held by the unfollow helper threads (call on app shutdown).
+    
+    Gives up after ``timeout`` seconds: helpers still busy with a batch are left to
+    exit with the process rather than holding up shutdown.
+    """
+    # Each helper must release its own browser; the barrier keeps the jobs on distinct threads
+    barrier = threading.Barrier(_UNFOLLOW_HELPERS)
+    
+    def release():
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        BrowserPool.shutdown()
+    
+    futures = [_unfollow_helpers.submit(release) for _ in range(_UNFOLLOW_HELPERS)]
+    _, pending = wait(futures, timeout=timeout)
+    if pending:
+        _log(f"[PLAYWRIGHT] {len(pending)} unfollow helpers still busy after {timeout:.0f}s, not waiting for them")
+    # Drop release jobs (and anything else) still queued behind a running batch
+    _unfollow_helpers.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_unfollow_batch(usernames: list, session_cookies: list, min_delay: int = 30, max_delay: int = 60, headless: bool = False, concurrency: int = 1):
+    """Unfollow multiple users with delays between each action, yielding as they finish.
+    
+    Yields ``(index, result)`` pairs in completion order, where ``index`` is the
+    user's position in ``usernames``, so callers can report progress per user.
+    Up to ``concurrency`` workers each open one logged-in page and take users
+    from a shared cursor, so each user only costs a profile navigation. Every
+    worker paces itself with the min/max delay after each of its unfollows.
+    Workers run on long-lived helper threads that keep their own pooled
+    browsers; closing the generator early stops them claiming further users.
+    """
+    total = len(usernames)
+    workers = min(max(1, concurrency), total, _UNFOLLOW_HELPERS)
+    
     _log(f"[PLAYWRIGHT] ========================================")
     _log(f"[PLAYWRIGHT] Starting batch unfollow")
-    _log(f"[PLAYWRIGHT] Users to unfollow: {len(usernames)}")
+    _log(f"[PLAYWRIGHT] Users to unfollow: {total}")
     _log(f"[PLAYWRIGHT] Delay range: {min_delay}-{max_delay} seconds")
+    _log(f"[PLAYWRIGHT] Workers: {workers}")
     _log(f"[PLAYWRIGHT] ========================================")
     
-    results = []
-    successful = 0
-    failed = 0
+    # Read the saved session once; every worker's context is created from it
+    state = _load_session_state(session_cookies)
     
-    for i, username in enumerate(usernames):
-        _log(f"[PLAYWRIGHT] Processing {i+1}/{len(usernames)}: {username}")
-        
-        # Unfollow the user
-        result = instagram_unfollow_user(username, session_cookies, headless)
-        results.append(result)
-        
-        if result['success']:
-            successful += 1
-            _log(f"[PLAYWRIGHT] Success ({successful}/{len(usernames)})")
-        else:
-            failed += 1
-            _log(f"[PLAYWRIGHT] Failed: {result.get('error', 'Unknown error')} ({failed} failures)")
-        
-        # Add delay between unfollows (except for the last one)
-        if i < len(usernames) - 1:
-            delay = random.uniform(min_delay, max_delay)
-            _log(f"[PLAYWRIGHT] Waiting {delay:.1f} seconds before next unfollow...")
-            time.sleep(delay)
+    # Workers claim the next index under the lock, so idle workers steal the remaining
+    # users without the whole list being copied into a queue first
+    counts = {'next': 0, 'successful': 0, 'failed': 0}
+    counts_lock = threading.Lock()
+    errors = []
+    slow = []  # (seconds, username) for users that took over half the per-user deadline
+    done = queue.Queue()  # (index, result) per user, then None once per finished worker
     
-    _log(f"[PLAYWRIGHT] ========================================")
-    _log(f"[PLAYWRIGHT] Batch unfollow complete!")
-    _log(f"[PLAYWRIGHT] Successful: {successful}")
-    _log(f"[PLAYWRIGHT] Failed: {failed}")
-    _log(f"[PLAYWRIGHT] ========================================")
+    def worker():
+        context = None
+        current = None
+        try:
+            while True:
+                with counts_lock:
+                    i = counts['next']
+                    if i >= total:
+                        return
+                    counts['next'] = i + 1
+                current = i
+                username = usernames[i]
+                
+                # Open this worker's page only once there is work for it
+                if context is None:
+                    context, page = _open_unfollow_page(session_cookies, headless, state)
+                    _warm_up(page)
+                
+                # Unfollow the user
+                started = time.monotonic()
+                result = _unfollow_on_page(page, username)
+                elapsed = time.monotonic() - started
+                done.put((i, result))
+                current = None
+                
+                # Add delay between unfollows (unless nothing is left to do)
+                delay = random.uniform(min_delay, max_delay) if counts['next'] < total else 0
+                wait_note = f", waiting {delay:.1f}s before next unfollow" if delay else ""
+                
+                # One summary line per user
+                with counts_lock:
+                    if elapsed > UNFOLLOW_DEADLINE_S / 2:
+                        slow.append((elapsed, username))
+                    if result['success']:
+                        counts['successful'] += 1
+                        _log(f"[PLAYWRIGHT] {i+1}/{total} {username}: success ({counts['successful']}/{total}){wait_note}")
+                    else:
+                        counts['failed'] += 1
+                        _log(f"[PLAYWRIGHT] {i+1}/{total} {username}: failed - {result.get('error', 'Unknown error')} ({counts['failed']} failures){wait_note}")
+                
+                if delay:
+                    # Yields to Playwright's dispatcher instead of freezing it like time.sleep
+                    page.wait_for_timeout(delay * 1000)
+        except Exception as e:
+            # This worker could not open a session; the others keep claiming users
+            _log(f"[PLAYWRIGHT] Exception in unfollow_batch worker: {str(e)}")
+            errors.append(str(e))
+            if current is not None:
+                with counts_lock:
+                    counts['failed'] += 1
+                done.put((current, {'success': False, 'username': usernames[current], 'error': str(e)}))
+        finally:
+            # Close context (the pooled browser stays up)
+            if context:
+                try:
+                    context.close()
+                except:
+                    pass
+            done.put(None)
+    
+    for _ in range(workers):
+        _unfollow_helpers.submit(worker)
+    
+    try:
+        running = workers
+        while running:
+            item = done.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+        
+        # Users no worker could reach fail with the session error
+        for i in range(counts['next'], total):
+            counts['failed'] += 1
+            yield i, {'success': False, 'username': usernames[i], 'error': errors[0] if errors else 'Not processed'}
+    finally:
+        # Stop the workers picking up more users if the caller stopped iterating
+        with counts_lock:
+            counts['next'] = total
+        
+        _log(f"[PLAYWRIGHT] ========================================")
+        _log(f"[PLAYWRIGHT] Batch unfollow complete!")
+        _log(f"[PLAYWRIGHT] Successful: {counts['successful']}")
+        _log(f"[PLAYWRIGHT] Failed: {counts['failed']}")
+        if slow:
+            slowest = ', '.join(f"{name} ({seconds:.1f}s)" for seconds, name in sorted(slow, reverse=True)[:5])
+            _log(f"[PLAYWRIGHT] Slow users (>{UNFOLLOW_DEADLINE_S / 2:.0f}s): {len(slow)} - slowest: {slowest}")
+        _log(f"[PLAYWRIGHT] ========================================")
+        _flush_log()
+
+
+def instagram_unfollow_batch(usernames: list, session_cookies: list, min_delay: int = 30, max_delay: int = 60, headless: bool = False, concurrency: int = 1) -> Dict:
+    """Unfollow multiple users and return every result at once, in input order.
+    
+    Collecting wrapper around iter_unfollow_batch for callers that only need
+    the final summary.
+    """
+    results = [None] * len(usernames)
+    for i, result in iter_unfollow_batch(usernames, session_cookies, min_delay, max_delay, headless, concurrency):
+        results[i] = result
+    
+    successful = sum(1 for result in results if result['success'])
     
     return {
-        'success': failed == 0,
+        'success': successful == len(results),
         'results': results,
         'summary': {
-            'total': len(usernames),
+            'total': len(results),
             'successful': successful,
-            'failed': failed
+            'failed': len(results) - successful
         }
     }
 
@@ -1355,6 +1638,47 @@ def instagram_unfollow_batch(usernames: list, session_cookies: list, min_delay:
 # API-BASED UNFOLLOW FUNCTIONS (Primary method)
 # ============================================================================
 
+class _RateLimiter:
+    """Token bucket shared between threads: ``rate`` calls per second, bursts of up to ``burst``."""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call may start."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Hold every caller back for ``seconds`` (e.g. a Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def _retry_after(headers, default: float = 60.0) -> float:
+    """Seconds to wait from a Retry-After header, or ``default`` if it's missing or not a number."""
+    try:
+        return float(headers.get('retry-after', default))
+    except (TypeError, ValueError):
+        return default
+
+
 def _extract_tokens_from_cookies(session_cookies: list) -> Dict:
     """Extract CSRF token and other required tokens from session cookies."""
     tokens = {
@@ -1383,11 +1707,6 @@ def instagram_unfollow_user_api(user_id: str, username: str, session_cookies: li
             _log(f"[API-UNFOLLOW] Missing required tokens")
             return {'success': False, 'username': username, 'error': 'Missing authentication tokens'}
         
-        # Prepare cookies for httpx
-        cookies = {}
-        for cookie in session_cookies:
-            cookies[cookie['name']] = cookie['value']
-        
         # Instagram API endpoint
         url = "https://www.instagram.com/graphql/query"
         
@@ -1405,12 +1724,12 @@ def instagram_unfollow_user_api(user_id: str, username: str, session_cookies: li
             'sec-fetch-dest': 'empty',
             'sec-fetch-mode': 'cors',
             'sec-fetch-site': 'same-origin',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'user-agent': USER_AGENT,
             'x-asbd-id': '129477',
             'x-csrftoken': tokens['csrftoken'],
             'x-fb-friendly-name': 'usePolarisUnfollowMutation',
             'x-fb-lsd': 'AVq-9YjDn5g',  # This might need to be dynamic
-            'x-ig-app-id': '936619743392459',
+            'x-ig-app-id': IG_APP_ID,
             'x-ig-www-claim': '0',
             'x-requested-with': 'XMLHttpRequest',
         }
@@ -1428,83 +1747,100 @@ def instagram_unfollow_user_api(user_id: str, username: str, session_cookies: li
         
         _log(f"[API-UNFOLLOW] Sending request to Instagram API...")
         
-        # Make the API call
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, headers=headers, cookies=cookies, data=payload)
-            
-            _log(f"[API-UNFOLLOW] Response status: {response.status_code}")
+        # Make the API call on the session's pooled client (cookies are already in its jar)
+        response = _http_client(session_cookies).post(url, headers=headers, data=payload)
+        
+        _log(f"[API-UNFOLLOW] Response status: {response.status_code}")
+        
+        if response.status_code == 200:
+            try:
+                data = orjson.loads(response.content)
+                # Check if the unfollow was successful
+                if 'data' in data or 'status' in data:
+                    _log(f"[API-UNFOLLOW] Successfully unfollowed: {username}")
+                    return {
+                        'success': True,
+                        'username': username,
+                        'method': 'api',
+                        'timestamp': datetime.now().isoformat()
+                    }
+                else:
+                    _log(f"[API-UNFOLLOW] Unexpected response: {data}")
+                    return {'success': False, 'username': username, 'error': 'Unexpected API response'}
+            except orjson.JSONDecodeError:
+                _log(f"[API-UNFOLLOW] Failed to parse response")
+                return {'success': False, 'username': username, 'error': 'Invalid JSON response'}
+        elif response.status_code == 429:
+            retry_after = _retry_after(response.headers)
+            _log(f"[API-UNFOLLOW] Rate limited, retry after {retry_after:.0f}s")
+            return {'success': False, 'username': username, 'error': 'HTTP 429', 'retry_after': retry_after}
+        else:
+            _log(f"[API-UNFOLLOW] HTTP error: {response.status_code}")
+            if response.status_code in (400, 404):
+                # The cached ID may no longer match this username (e.g. the account was renamed)
+                _forget_user_id(username)
+            return {'success': False, 'username': username, 'error': f'HTTP {response.status_code}'}
             
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    # Check if the unfollow was successful
-                    if 'data' in data or 'status' in data:
-                        _log(f"[API-UNFOLLOW] Successfully unfollowed: {username}")
-                        return {
-                            'success': True,
-                            'username': username,
-                            'method': 'api',
-                            'timestamp': datetime.now().isoformat()
-                        }
-                    else:
-                        _log(f"[API-UNFOLLOW] Unexpected response: {data}")
-                        return {'success': False, 'username': username, 'error': 'Unexpected API response'}
-                except json.JSONDecodeError:
-                    _log(f"[API-UNFOLLOW] Failed to parse response")
-                    return {'success': False, 'username': username, 'error': 'Invalid JSON response'}
-            else:
-                _log(f"[API-UNFOLLOW] HTTP error: {response.status_code}")
-                return {'success': False, 'username': username, 'error': f'HTTP {response.status_code}'}
-                
     except Exception as e:
         _log(f"[API-UNFOLLOW] Exception: {str(e)}")
         return {'success': False, 'username': username, 'error': str(e)}
 
 
-def instagram_unfollow_batch_api(user_data: list, session_cookies: list, delay: int = 3) -> Dict:
+def instagram_unfollow_batch_api(user_data: list, session_cookies: list, delay: int = 3, concurrency: int = 1) -> Dict:
     """
     Unfollow multiple users using API (primary method).
     user_data: List of dicts with 'username' and 'user_id' keys
+    
+    Calls start at most once per ``delay`` seconds across up to ``concurrency``
+    threads, so a slow response no longer stretches the gap to the next call.
+    A 429 pauses every thread for the response's Retry-After.
     """
+    total = len(user_data)
+    workers = min(max(1, concurrency), total)
+    
     _log(f"[API-UNFOLLOW] ========================================")
     _log(f"[API-UNFOLLOW] Starting batch API unfollow")
-    _log(f"[API-UNFOLLOW] Users to unfollow: {len(user_data)}")
+    _log(f"[API-UNFOLLOW] Users to unfollow: {total}")
     _log(f"[API-UNFOLLOW] Delay between calls: {delay} seconds")
+    _log(f"[API-UNFOLLOW] Workers: {workers}")
     _log(f"[API-UNFOLLOW] ========================================")
     
-    results = []
-    successful = 0
-    failed = 0
+    results = [None] * total
+    counts = {'successful': 0, 'failed': 0}
+    counts_lock = threading.Lock()
+    limiter = _RateLimiter(1 / delay if delay > 0 else float('inf'))
     
-    for i, user in enumerate(user_data):
+    def unfollow(i: int):
+        user = user_data[i]
         username = user['username']
         user_id = user.get('user_id')
         
-        _log(f"[API-UNFOLLOW] Processing {i+1}/{len(user_data)}: {username}")
-        
         # Check if we have user_id
         if not user_id:
-            _log(f"[API-UNFOLLOW] No user_id for {username}, skipping API method")
             result = {'success': False, 'username': username, 'error': 'No user_id available'}
-            results.append(result)
-            failed += 1
-            continue
-        
-        # Unfollow via API
-        result = instagram_unfollow_user_api(user_id, username, session_cookies)
-        results.append(result)
-        
-        if result['success']:
-            successful += 1
-            _log(f"[API-UNFOLLOW] Success ({successful}/{len(user_data)})")
         else:
-            failed += 1
-            _log(f"[API-UNFOLLOW] Failed: {result.get('error', 'Unknown error')} ({failed} failures)")
-        
-        # Add delay between API calls (except for the last one)
-        if i < len(user_data) - 1:
-            _log(f"[API-UNFOLLOW] Waiting {delay} seconds before next API call...")
-            time.sleep(delay)
+            # Unfollow via API once the shared rate limit allows another call
+            limiter.acquire()
+            result = instagram_unfollow_user_api(user_id, username, session_cookies)
+            if result.get('retry_after'):
+                limiter.pause(result['retry_after'])
+        results[i] = result
+        
+        # One summary line per user
+        with counts_lock:
+            if result['success']:
+                counts['successful'] += 1
+                _log(f"[API-UNFOLLOW] {i+1}/{total} {username}: success ({counts['successful']}/{total})")
+            else:
+                counts['failed'] += 1
+                _log(f"[API-UNFOLLOW] {i+1}/{total} {username}: failed - {result.get('error', 'Unknown error')} ({counts['failed']} failures)")
+    
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-unfollow') as pool:
+            list(pool.map(unfollow, range(total)))
+    
+    successful = counts['successful']
+    failed = counts['failed']
     
     _log(f"[API-UNFOLLOW] ========================================")
     _log(f"[API-UNFOLLOW] Batch API unfollow complete!")
@@ -1516,7 +1852,7 @@ def instagram_unfollow_batch_api(user_data: list, session_cookies: list, delay:
         'success': failed == 0,
         'results': results,
         'summary': {
-            'total': len(user_data),
+            'total': total,
             'successful': successful,
             'failed': failed
         }
@@ -9,23 +9,26 @@ from datetime import datetime, timedelta
 import asyncio
 import uuid
 import sys
+import threading
 import httpx
 
 # Fix for Windows - use WindowsProactorEventLoopPolicy for subprocess support
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-from .config import settings
+from .config import Settings, get_settings, settings
 from .database import get_db, init_db
 from .models import User, Action, Session as DBSession, UnfollowQueue
+from .instagram_http import check_session
 from .instagram_sync import (
+    BrowserPool,
     instagram_login,
-    instagram_get_followers,
-    instagram_get_following,
     instagram_get_followers_api,
     instagram_get_following_api,
     instagram_unfollow_batch,
-    instagram_unfollow_batch_api
+    instagram_unfollow_batch_api,
+    instagram_resolve_user_ids,
+    release_unfollow_browsers
 )
 from concurrent.futures import ThreadPoolExecutor
 
@@ -48,7 +51,8 @@ app.add_middleware(
 active_bots = {}
 
 # Thread pool for synchronous Playwright operations
-executor = ThreadPoolExecutor(max_workers=3)
+EXECUTOR_WORKERS = 3
+executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS)
 
 
 # Pydantic models
@@ -131,6 +135,31 @@ async def shutdown_event():
             await bot.close()
         except:
             pass
+    
+    # The browsers shared by the async bots (imported here so startup doesn't load that module)
+    from .instagram import BrowserPool as BotBrowserPool
+    try:
+        await BotBrowserPool.shutdown()
+    except:
+        pass
+    
+    # Pooled browsers belong to the worker thread that launched them, so each
+    # worker has to release its own; the barrier keeps the jobs on distinct threads.
+    barrier = threading.Barrier(EXECUTOR_WORKERS)
+    
+    def release_worker_browsers():
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        BrowserPool.shutdown()
+    
+    loop = asyncio.get_event_loop()
+    await asyncio.gather(
+        *(loop.run_in_executor(executor, release_worker_browsers) for _ in range(EXECUTOR_WORKERS)),
+        loop.run_in_executor(None, release_unfollow_browsers),
+        return_exceptions=True
+    )
 
 
 # API endpoints
@@ -244,6 +273,41 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
         )
 
 
+@app.post("/api/auth/session", response_model=LoginResponse)
+async def validate_session(session_id: str, db: Session = Depends(get_db)):
+    """Re-check a session the client already holds, so it can be reused without a new login."""
+    db_session = db.query(DBSession).filter(
+        DBSession.session_id == session_id,
+        DBSession.is_active == True
+    ).first()
+    
+    if not db_session:
+        return LoginResponse(success=False, error="Invalid or expired session")
+    
+    # The session's cookies must still be accepted by Instagram
+    if not await check_session(db_session.cookies, db_session.username):
+        print(f"[LOGIN] Saved session no longer valid: {session_id}")
+        db_session.is_active = False
+        db.commit()
+        return LoginResponse(success=False, error="Session expired - please log in again")
+    
+    db_session.last_used = datetime.utcnow()
+    db.add(Action(
+        action_type='login',
+        username=db_session.username,
+        status='success',
+        details={'session_id': session_id, 'reused': True}
+    ))
+    db.commit()
+    
+    print(f"[LOGIN] Reused saved session: {session_id}")
+    return LoginResponse(
+        success=True,
+        session_id=session_id,
+        username=db_session.username
+    )
+
+
 @app.post("/api/auth/logout")
 async def logout(session_id: str, db: Session = Depends(get_db)):
     """Logout and close session."""
@@ -516,15 +580,26 @@ async def complete_analysis(
         
         loop = asyncio.get_event_loop()
         
-        # 1. Fetch followers
-        print(f"[COMPLETE ANALYSIS] Step 1: Fetching followers...")
-        followers_result = await loop.run_in_executor(
-            executor,
-            instagram_get_followers,
-            username,
-            db_session.cookies,
-            limit,
-            False
+        # 1-2. Fetch followers and following side by side (API first, falls back to HTML
+        # scraping); each job runs on its own executor thread with that thread's pooled browser
+        print(f"[COMPLETE ANALYSIS] Steps 1-2: Fetching followers and following concurrently...")
+        followers_result, following_result = await asyncio.gather(
+            loop.run_in_executor(
+                executor,
+                instagram_get_followers_api,
+                username,
+                db_session.cookies,
+                limit,
+                False
+            ),
+            loop.run_in_executor(
+                executor,
+                instagram_get_following_api,
+                username,
+                db_session.cookies,
+                limit,
+                False
+            )
         )
         
         if not followers_result['success']:
@@ -533,17 +608,6 @@ async def complete_analysis(
         followers = followers_result['followers']
         print(f"[COMPLETE ANALYSIS] Fetched {len(followers)} followers")
         
-        # 2. Fetch following
-        print(f"[COMPLETE ANALYSIS] Step 2: Fetching following...")
-        following_result = await loop.run_in_executor(
-            executor,
-            instagram_get_following,
-            username,
-            db_session.cookies,
-            limit,
-            False
-        )
-        
         if not following_result['success']:
             raise HTTPException(status_code=500, detail=f"Failed to fetch following: {following_result.get('error')}")
         
@@ -557,12 +621,15 @@ async def complete_analysis(
             if existing_user:
                 existing_user.full_name = follower.get('full_name', '')
                 existing_user.is_verified = follower.get('is_verified', False)
+                # Update user_id if we got it from API
+                if follower.get('user_id'):
+                    existing_user.user_id = str(follower.get('user_id'))
                 existing_user.is_following_me = True
                 existing_user.updated_at = datetime.utcnow()
             else:
                 new_user = User(
                     username=follower['username'],
-                    user_id=follower['username'],
+                    user_id=str(follower.get('user_id', follower['username'])),  # Use real ID if available
                     full_name=follower.get('full_name', ''),
                     is_verified=follower.get('is_verified', False),
                     is_following_me=True
@@ -576,12 +643,15 @@ async def complete_analysis(
             if existing_user:
                 existing_user.full_name = followed_user.get('full_name', '')
                 existing_user.is_verified = followed_user.get('is_verified', False)
+                # Update user_id if we got it from API
+                if followed_user.get('user_id'):
+                    existing_user.user_id = str(followed_user.get('user_id'))
                 existing_user.i_am_following = True
                 existing_user.updated_at = datetime.utcnow()
             else:
                 new_user = User(
                     username=followed_user['username'],
-                    user_id=followed_user['username'],
+                    user_id=str(followed_user.get('user_id', followed_user['username'])),  # Use real ID if available
                     full_name=followed_user.get('full_name', ''),
                     is_verified=followed_user.get('is_verified', False),
                     i_am_following=True
@@ -713,7 +783,8 @@ async def get_non_followers(
 async def unfollow_users(
     request: UnfollowRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
 ):
     """Unfollow users using synchronous Playwright."""
     print(f"[UNFOLLOW] ========================================")
@@ -754,11 +825,32 @@ async def unfollow_users(
         
         for username in request.usernames:
             user = db.query(User).filter(User.username == username).first()
-            if user and user.user_id:
+            # Rows from the HTML scraper store the username as user_id - only numeric IDs work with the API
+            if user and user.user_id and user.user_id.isdigit():
                 users_with_ids.append({'username': username, 'user_id': user.user_id})
             else:
                 users_without_ids.append(username)
         
+        # Look up missing IDs over HTTP so those users can take the API path too;
+        # only users that still can't be resolved need a browser
+        if users_without_ids:
+            print(f"[UNFOLLOW] Resolving {len(users_without_ids)} missing user IDs...")
+            loop = asyncio.get_event_loop()
+            resolved_ids = await loop.run_in_executor(
+                executor,
+                instagram_resolve_user_ids,
+                users_without_ids,
+                db_session.cookies
+            )
+            for username, user_id in resolved_ids.items():
+                users_with_ids.append({'username': username, 'user_id': user_id})
+                # Store the resolved ID so later batches don't look it up again
+                user = db.query(User).filter(User.username == username).first()
+                if user and not db.query(User).filter(User.user_id == user_id).first():
+                    user.user_id = user_id
+            db.commit()
+            users_without_ids = [username for username in users_without_ids if username not in resolved_ids]
+        
         print(f"[UNFOLLOW] Users with ID (API method): {len(users_with_ids)}")
         print(f"[UNFOLLOW] Users without ID (Playwright fallback): {len(users_without_ids)}")
         
@@ -773,7 +865,8 @@ async def unfollow_users(
                 instagram_unfollow_batch_api,
                 users_with_ids,
                 db_session.cookies,
-                3  # 3 second delay between API calls
+                3,  # 3 second delay between API calls
+                settings.unfollow_concurrency
             )
             all_results.extend(api_result['results'])
             print(f"[UNFOLLOW] API batch complete: {api_result['summary']['successful']}/{api_result['summary']['total']} successful")
@@ -789,7 +882,8 @@ async def unfollow_users(
                 db_session.cookies,
                 settings.min_action_delay,
                 settings.max_action_delay,
-                False  # headless=False to see browser
+                False,  # headless=False to see browser
+                settings.unfollow_concurrency
             )
             all_results.extend(playwright_result['results'])
             print(f"[UNFOLLOW] Playwright batch complete: {playwright_result['summary']['successful']}/{playwright_result['summary']['total']} successful")
@@ -799,7 +893,12 @@ async def unfollow_users(
         # Log actions and update database
         errors = []
         for unfollow_result in all_results:
-            status = 'success' if unfollow_result['success'] else 'failed'
+            # Profiles that already weren't followed are recorded apart, so they don't count
+            # toward the daily limit or the unfollow stats
+            if unfollow_result.get('skipped'):
+                status = 'skipped'
+            else:
+                status = 'success' if unfollow_result['success'] else 'failed'
             action = Action(
                 action_type='unfollow',
                 username=unfollow_result['username'],
@@ -814,7 +913,7 @@ async def unfollow_users(
                 if user:
                     user.i_am_following = False
                     user.updated_at = datetime.utcnow()
-                print(f"[UNFOLLOW] ✓ {unfollow_result['username']}")
+                print(f"[UNFOLLOW] {'-' if status == 'skipped' else '✓'} {unfollow_result['username']}")
             else:
                 error_msg = f"{unfollow_result['username']}: {unfollow_result.get('error', 'Unknown error')}"
                 errors.append(error_msg)
@@ -823,11 +922,12 @@ async def unfollow_users(
         db.commit()
         
         # Calculate summary
-        successful = sum(1 for r in all_results if r['success'])
+        skipped = sum(1 for r in all_results if r.get('skipped'))
+        successful = sum(1 for r in all_results if r['success']) - skipped
         failed = sum(1 for r in all_results if not r['success'])
         
         print(f"[UNFOLLOW] ========================================")
-        print(f"[UNFOLLOW] Complete! Success: {successful}, Failed: {failed}")
+        print(f"[UNFOLLOW] Complete! Success: {successful}, Skipped: {skipped}, Failed: {failed}")
         print(f"[UNFOLLOW] ========================================")
         
         return UnfollowResponse(
@@ -1037,7 +1137,10 @@ async def get_whitelist(db: Session = Depends(get_db)):
 
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
+):
     """Get usage statistics."""
     try:
         today = datetime.utcnow().date()
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import LoginForm from './components/LoginForm';
 import Dashboard from './components/Dashboard';
+import { authApi } from './services/api';
 import type { LoginResponse } from './types';
 
 interface Session {
@@ -11,13 +12,22 @@ interface Session {
 function App() {
   const [session, setSession] = useState<Session | null>(null);
 
-  // Load session from localStorage on mount
+  // Load session from localStorage on mount, keeping it only if the backend still accepts it
   useEffect(() => {
     const savedSession = localStorage.getItem('instagram_session');
     if (savedSession) {
       try {
-        const parsed = JSON.parse(savedSession);
-        setSession(parsed);
+        const parsed: Session = JSON.parse(savedSession);
+        authApi
+          .validateSession(parsed.sessionId)
+          .then((response) => {
+            if (response.success) {
+              setSession(parsed);
+            } else {
+              localStorage.removeItem('instagram_session');
+            }
+          })
+          .catch(() => localStorage.removeItem('instagram_session'));
       } catch (err) {
         localStorage.removeItem('instagram_session');
       }
@@ -21,6 +21,11 @@ export const authApi = {
     return response.data;
   },
 
+  validateSession: async (sessionId: string): Promise<LoginResponse> => {
+    const response = await api.post('/auth/session', null, { params: { session_id: sessionId } });
+    return response.data;
+  },
+
   logout: async (sessionId: string): Promise<void> => {
     await api.post('/auth/logout', null, { params: { session_id: sessionId } });
   },